@@ -9,10 +9,17 @@ Verifies that inbound task dispatches:
 
 from __future__ import annotations
 
-import json
 import logging
+from typing import Any
 
-from shared.crypto import verify_signature
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PublicKey
+
+from shared import fastjson
+from shared.crypto import (
+    canonical_json,
+    public_key_from_hex,
+    verify_with_key,
+)
 from shared.schemas import RejectionReason, TaskPlan
 
 logger = logging.getLogger(__name__)
@@ -26,6 +33,7 @@ class RequestAuthenticator:
         # startup.  In production it would be fetched from Agentverse
         # or the Almanac contract.
         self._orchestrator_pubkey = orchestrator_public_key_hex
+        self._verify_key = _load_key(orchestrator_public_key_hex)
 
     @property
     def has_key(self) -> bool:
@@ -33,39 +41,74 @@ class RequestAuthenticator:
 
     def set_orchestrator_key(self, public_key_hex: str) -> None:
         self._orchestrator_pubkey = public_key_hex
+        self._verify_key = _load_key(public_key_hex)
         logger.info("Orchestrator public key configured")
 
     def verify_dispatch(
         self,
-        task_plan_json: str,
+        task_plan: str | bytes | dict[str, Any],
         signature_hex: str,
-    ) -> tuple[bool, RejectionReason | None]:
+    ) -> tuple[bool, RejectionReason | None, dict[str, Any] | None]:
         """
         Verify the signature over a serialised task plan.
 
-        Returns ``(True, None)`` on success or ``(False, reason)``
-        on failure.
+        *task_plan* may be the raw JSON or an already-parsed dict.  Returns
+        ``(True, None, plan_dict)`` on success or ``(False, reason,
+        plan_dict)`` on failure, so callers can build the
+        :class:`TaskPlan` without parsing the JSON a second time.
+        ``plan_dict`` is *None* when the signature is missing or the JSON
+        could not be parsed.
         """
         if not self._orchestrator_pubkey:
             logger.warning("No orchestrator public key configured – skipping verification")
             # In dev mode we allow unsigned requests
-            return True, None
+            return True, None, _parse_plan(task_plan)
 
         if not signature_hex:
-            return False, RejectionReason.INVALID_SIGNATURE
+            return False, RejectionReason.INVALID_SIGNATURE, None
+
+        plan_dict = _parse_plan(task_plan)
+        if plan_dict is None or self._verify_key is None:
+            return False, RejectionReason.INVALID_SIGNATURE, plan_dict
+
+        # The orchestrator ships the exact canonical bytes it signed, so
+        # check those first and skip re-serialising the parsed plan
+        if not isinstance(task_plan, dict):
+            raw = task_plan.encode() if isinstance(task_plan, str) else task_plan
+            if verify_with_key(self._verify_key, raw, signature_hex):
+                return True, None, plan_dict
 
+        # Senders that shipped non-canonical JSON: re-canonicalise
         try:
-            plan_dict = json.loads(task_plan_json)
-        except json.JSONDecodeError:
-            return False, RejectionReason.INVALID_SIGNATURE
-
-        ok = verify_signature(
-            public_key_hex=self._orchestrator_pubkey,
-            payload=plan_dict,
-            signature_hex=signature_hex,
-        )
+            canonical = canonical_json(plan_dict)
+        except (TypeError, ValueError):
+            return False, RejectionReason.INVALID_SIGNATURE, plan_dict
+
+        ok = verify_with_key(self._verify_key, canonical, signature_hex)
         if not ok:
             logger.warning("Signature verification failed")
-            return False, RejectionReason.INVALID_SIGNATURE
-
-        return True, None
+            return False, RejectionReason.INVALID_SIGNATURE, plan_dict
+
+        return True, None, plan_dict
+
+
+def _load_key(public_key_hex: str | None) -> Ed25519PublicKey | None:
+    """Parse the orchestrator key once; a malformed key verifies nothing."""
+    if not public_key_hex:
+        return None
+    try:
+        return public_key_from_hex(public_key_hex)
+    except ValueError:
+        logger.error("Orchestrator public key is not a valid Ed25519 key")
+        return None
+
+
+def _parse_plan(task_plan: str | bytes | dict[str, Any]) -> dict[str, Any] | None:
+    """Return *task_plan* as a dict, or *None* if it is not a JSON object."""
+    if isinstance(task_plan, dict):
+        return task_plan
+    try:
+        plan_dict = fastjson.loads(task_plan)
+    except ValueError:  # bad JSON, or bytes that are not UTF-8
+        return None
+    return plan_dict if isinstance(plan_dict, dict) else None
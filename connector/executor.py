@@ -2,10 +2,10 @@
 Task plan executor for the OpenClaw Connector.
 
 Translates a :class:`TaskPlan` into concrete local actions, executes
-them sequentially, and collects results.
+them in plan order, and collects results.
 
 Execution rules (from the design doc):
-  • Steps run sequentially
+  • Steps run in order (consecutive independent steps may overlap)
   • Failures are reported per step
   • No automatic retries without user consent
   • Task plans are treated as immutable
@@ -13,7 +13,10 @@ Execution rules (from the design doc):
 
 from __future__ import annotations
 
+import importlib
+import inspect
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Callable
 
 from shared.schemas import (
@@ -22,16 +25,7 @@ from shared.schemas import (
     StepType,
     TaskPlan,
     TaskStatus,
-)
-from connector.workflows.weekly_report import (
-    generate_report,
-    post_summary,
-    scan_directory,
-)
-from connector.workflows.repo_analyzer import (
-    analyze_repo,
-    clone_repo,
-    generate_health_report,
+    TaskStep,
 )
 
 logger = logging.getLogger(__name__)
@@ -45,21 +39,82 @@ ActionFn = Callable[[dict[str, Any]], dict[str, Any]]
 # Two-arg variants accept (params, previous_output)
 ActionFn2 = Callable[[dict[str, Any], dict[str, Any] | None], dict[str, Any]]
 
-_ACTIONS: dict[str, ActionFn | ActionFn2] = {
+
+class _LazyAction:
+    """Built-in action whose workflow module is imported on first use."""
+
+    __slots__ = ("module", "attr")
+
+    def __init__(self, module: str, attr: str) -> None:
+        self.module = module
+        self.attr = attr
+
+    def load(self) -> ActionFn | ActionFn2:
+        return getattr(importlib.import_module(self.module), self.attr)
+
+
+_WEEKLY_REPORT = "connector.workflows.weekly_report"
+_REPO_ANALYZER = "connector.workflows.repo_analyzer"
+
+_ACTIONS: dict[str, ActionFn | ActionFn2 | _LazyAction] = {
     # Weekly report workflow
-    "scan_directory": scan_directory,
-    "generate_report": generate_report,
-    "post_summary": post_summary,
+    "scan_directory": _LazyAction(_WEEKLY_REPORT, "scan_directory"),
+    "generate_report": _LazyAction(_WEEKLY_REPORT, "generate_report"),
+    "post_summary": _LazyAction(_WEEKLY_REPORT, "post_summary"),
     # Repo analyzer workflow
-    "clone_repo": clone_repo,
-    "analyze_repo": analyze_repo,
-    "generate_health_report": generate_health_report,
+    "clone_repo": _LazyAction(_REPO_ANALYZER, "clone_repo"),
+    "analyze_repo": _LazyAction(_REPO_ANALYZER, "analyze_repo"),
+    "generate_health_report": _LazyAction(_REPO_ANALYZER, "generate_health_report"),
 }
 
 
-def register_action(name: str, fn: ActionFn | ActionFn2) -> None:
-    """Register a custom action handler."""
+# Resolved dispatch entries: action -> (handler, takes previous_output).
+# Filled on first use / registration so the per-step path is one dict
+# lookup with no ``inspect`` call.
+_DISPATCH: dict[str, tuple[ActionFn | ActionFn2, bool]] = {}
+
+# Single-arg actions with no side effects on shared state; consecutive
+# steps using these may run concurrently
+_INDEPENDENT_ACTIONS: set[str] = {"scan_directory", "summarise_text"}
+
+_MAX_PARALLEL_STEPS = 8
+
+
+def _takes_previous(fn: ActionFn | ActionFn2) -> bool:
+    return len(inspect.signature(fn).parameters) >= 2
+
+
+def _resolve(name: str) -> tuple[ActionFn | ActionFn2, bool] | None:
+    """Return the dispatch entry for *name*, importing a lazy built-in if needed."""
+    entry = _DISPATCH.get(name)
+    if entry is None:
+        handler = _ACTIONS.get(name)
+        if handler is None:
+            return None
+        if isinstance(handler, _LazyAction):
+            handler = _ACTIONS[name] = handler.load()
+        entry = _DISPATCH[name] = (handler, _takes_previous(handler))
+    return entry
+
+
+def register_action(
+    name: str,
+    fn: ActionFn | ActionFn2,
+    independent: bool = False,
+) -> None:
+    """
+    Register a custom action handler.
+
+    Plans are executed in a worker thread, so *fn* must be thread-safe.
+    Pass ``independent=True`` for single-argument handlers that may run
+    concurrently with neighbouring independent steps.
+    """
     _ACTIONS[name] = fn
+    _DISPATCH[name] = (fn, _takes_previous(fn))
+    if independent:
+        _INDEPENDENT_ACTIONS.add(name)
+    else:
+        _INDEPENDENT_ACTIONS.discard(name)
 
 
 # ---------------------------------------------------------------------------
@@ -79,65 +134,114 @@ _ACTIONS["summarise_text"] = _summarise_text
 # Executor
 # ---------------------------------------------------------------------------
 
+def _run_step(
+    step: TaskStep,
+    previous_output: dict[str, Any] | None,
+) -> StepResult:
+    """
+    Run one step, converting failures into a FAILED :class:`StepResult`.
+
+    Results are built with ``model_construct``: every field comes from
+    local code, so Pydantic validation would only cost time.
+    """
+    entry = _resolve(step.action)
+    if entry is None:
+        logger.error("Unknown action '%s' – skipping", step.action)
+        return StepResult.model_construct(
+            action=step.action,
+            status=TaskStatus.FAILED,
+            output=None,
+            error=f"Unknown action: {step.action}",
+        )
+
+    handler, takes_previous = entry
+    try:
+        # Some handlers accept previous output (pipeline chaining)
+        if takes_previous:
+            output = handler(step.params, previous_output)
+        else:
+            output = handler(step.params)
+    except Exception as exc:
+        logger.exception("Step %s failed", step.action)
+        return StepResult.model_construct(
+            action=step.action,
+            status=TaskStatus.FAILED,
+            output=None,
+            error=str(exc),
+        )
+
+    return StepResult.model_construct(
+        action=step.action,
+        status=TaskStatus.COMPLETED,
+        output=output,
+        error=None,
+    )
+
+
+def _is_independent(step: TaskStep) -> bool:
+    if step.action not in _INDEPENDENT_ACTIONS:
+        return False
+    entry = _resolve(step.action)
+    return entry is not None and not entry[1]
+
+
+def _step_runs(steps: list[TaskStep]) -> list[list[TaskStep]]:
+    """Group consecutive independent steps; every other step runs alone."""
+    runs: list[list[TaskStep]] = []
+    for step in steps:
+        if runs and _is_independent(step) and _is_independent(runs[-1][-1]):
+            runs[-1].append(step)
+        else:
+            runs.append([step])
+    return runs
+
+
 def execute_plan(plan: TaskPlan) -> ExecutionResult:
     """
-    Execute every step in *plan* sequentially and return an
-    :class:`ExecutionResult`.
+    Execute the steps in *plan* and return an :class:`ExecutionResult`.
+
+    Steps run in order; only consecutive independent steps (see
+    :func:`register_action`) are overlapped, and their results are still
+    reported in plan order.
     """
     step_results: list[StepResult] = []
     overall_status = TaskStatus.COMPLETED
     aggregated_outputs: dict[str, Any] = {}
     previous_output: dict[str, Any] | None = None
-
-    for idx, step in enumerate(plan.steps):
-        logger.info(
-            "[%s] Step %d/%d – %s:%s",
-            plan.task_id, idx + 1, len(plan.steps), step.type.value, step.action,
-        )
-
-        handler = _ACTIONS.get(step.action)
-        if handler is None:
-            sr = StepResult(
-                action=step.action,
-                status=TaskStatus.FAILED,
-                error=f"Unknown action: {step.action}",
-            )
-            step_results.append(sr)
-            overall_status = TaskStatus.PARTIAL
-            logger.error("Unknown action '%s' – skipping", step.action)
-            continue
-
-        try:
-            # Some handlers accept previous output (pipeline chaining)
-            import inspect
-            sig = inspect.signature(handler)
-            if len(sig.parameters) >= 2:
-                output = handler(step.params, previous_output)
+    failed = 0
+
+    info_enabled = logger.isEnabledFor(logging.INFO)
+    idx = 0
+    for run in _step_runs(plan.steps):
+        if info_enabled:
+            for step in run:
+                idx += 1
+                logger.info(
+                    "[%s] Step %d/%d – %s:%s",
+                    plan.task_id, idx, len(plan.steps), step.type.value, step.action,
+                )
+
+        if len(run) == 1:
+            run_results = [_run_step(run[0], previous_output)]
+        else:
+            with ThreadPoolExecutor(
+                max_workers=min(_MAX_PARALLEL_STEPS, len(run))
+            ) as pool:
+                # Independent steps never read previous_output
+                run_results = list(pool.map(lambda st: _run_step(st, None), run))
+
+        for sr in run_results:
+            if sr.status == TaskStatus.COMPLETED:
+                previous_output = sr.output
+                aggregated_outputs[sr.action] = sr.output
             else:
-                output = handler(step.params)
-
-            sr = StepResult(
-                action=step.action,
-                status=TaskStatus.COMPLETED,
-                output=output,
-            )
-            previous_output = output
-            aggregated_outputs[step.action] = output
-
-        except Exception as exc:
-            logger.exception("Step %s failed", step.action)
-            sr = StepResult(
-                action=step.action,
-                status=TaskStatus.FAILED,
-                error=str(exc),
-            )
-            overall_status = TaskStatus.PARTIAL
-            # Do not abort – report per-step and continue (design doc §6)
-
-        step_results.append(sr)
+                # Do not abort – report per-step and continue (design doc §6)
+                overall_status = TaskStatus.PARTIAL
+                failed += 1
+            step_results.append(sr)
 
     # If every step failed, mark overall as failed
-    if all(s.status == TaskStatus.FAILED for s in step_results):
+    if failed == len(step_results):
         overall_status = TaskStatus.FAILED
 
     return ExecutionResult(
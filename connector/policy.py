@@ -12,8 +12,10 @@ from __future__ import annotations
 
 import logging
 import os
+from bisect import bisect_right
 from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Any
 
 from shared.schemas import RejectionReason, TaskPlan, TaskStep
 
@@ -63,12 +65,35 @@ class LocalPolicy:
     require_user_confirmation: bool = True
     allow_background_execution: bool = False
 
+    # frozen copy of allowed_actions for O(1) lookups whatever type was passed
+    _allowed_actions_fs: frozenset[str] = field(
+        default=frozenset(), init=False, repr=False
+    )
+    # sandbox roots resolved once, each with a trailing separator, sorted
+    # and with nested roots dropped so a single bisect finds the candidate
+    _resolved_allowed: tuple[str, ...] = field(
+        default=(), init=False, repr=False
+    )
+
+    def __post_init__(self) -> None:
+        self._allowed_actions_fs = frozenset(self.allowed_actions)
+
+        prefixes: list[str] = []
+        for root in sorted(
+            {str(Path(p).resolve()).rstrip(os.sep) + os.sep for p in self.allowed_paths}
+        ):
+            # Paths under a root sort directly after it
+            if prefixes and root.startswith(prefixes[-1]):
+                continue
+            prefixes.append(root)
+        self._resolved_allowed = tuple(prefixes)
+
     # ------------------------------------------------------------------
     # Checks
     # ------------------------------------------------------------------
 
     def check_action(self, step: TaskStep) -> RejectionReason | None:
-        if step.action not in self.allowed_actions:
+        if step.action not in self._allowed_actions_fs:
             logger.warning("Action '%s' not in local allowlist", step.action)
             return RejectionReason.ACTION_NOT_ALLOWED
         return None
@@ -77,20 +102,52 @@ class LocalPolicy:
         raw_path = step.params.get("path")
         if raw_path is None:
             return None  # no path param → OK
+        return self._check_raw_path(raw_path)
 
+    def _check_raw_path(self, raw_path: str) -> RejectionReason | None:
         resolved = str(Path(os.path.expanduser(raw_path)).resolve())
-        for allowed in self.allowed_paths:
-            allowed_resolved = str(Path(allowed).resolve())
-            if resolved.startswith(allowed_resolved):
-                return None
+        # Compare against "<root>/" so /tmp does not admit /tmpfoo
+        candidate = resolved + os.sep
+        idx = bisect_right(self._resolved_allowed, candidate) - 1
+        if idx >= 0 and candidate.startswith(self._resolved_allowed[idx]):
+            return None
 
         logger.warning("Path '%s' not within allowed sandboxes", resolved)
         return RejectionReason.PATH_NOT_ALLOWED
 
     def validate_plan(self, plan: TaskPlan) -> RejectionReason | None:
         """Run all local policy checks on the plan.  Returns *None* on success."""
-        for step in plan.steps:
-            rejection = self.check_action(step) or self.check_path(step)
-            if rejection is not None:
-                return rejection
+        return self.validate_dict(plan.model_dump(mode="json"))
+
+    def validate_dict(self, plan_dict: dict[str, Any]) -> RejectionReason | None:
+        """
+        Run all local policy checks on a raw plan dict.
+
+        Only ``steps[].action`` and ``steps[].params.path`` are read, so a
+        dispatch can be rejected before the full :class:`TaskPlan` is
+        validated.  Structurally invalid plans are a policy violation.
+        Steps are checked in order and the first failure is reported.
+        """
+        steps = plan_dict.get("steps")
+        if not isinstance(steps, list):
+            return RejectionReason.POLICY_VIOLATION
+
+        allowed_actions = self._allowed_actions_fs
+        for step in steps:
+            if not isinstance(step, dict):
+                return RejectionReason.POLICY_VIOLATION
+            action = step.get("action")
+            if not isinstance(action, str):
+                return RejectionReason.POLICY_VIOLATION
+            if action not in allowed_actions:
+                logger.warning("Action '%s' not in local allowlist", action)
+                return RejectionReason.ACTION_NOT_ALLOWED
+            params = step.get("params")
+            if isinstance(params, dict) and params.get("path") is not None:
+                raw_path = params["path"]
+                if not isinstance(raw_path, str):
+                    return RejectionReason.PATH_NOT_ALLOWED
+                rejection = self._check_raw_path(raw_path)
+                if rejection is not None:
+                    return rejection
         return None
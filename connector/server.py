@@ -15,7 +15,7 @@ Usage:
 
 from __future__ import annotations
 
-import json
+import asyncio
 import logging
 import os
 from pathlib import Path
@@ -59,6 +59,8 @@ logger.info("Device public key: %s", DEVICE_PUBLIC_KEY_HEX)
 # ---------------------------------------------------------------------------
 
 from connector.auth import RequestAuthenticator  # noqa: E402
+from connector.executor import execute_plan  # noqa: E402
+from shared import fastjson  # noqa: E402
 from connector.policy import LocalPolicy  # noqa: E402
 
 authenticator = RequestAuthenticator()
@@ -70,6 +72,19 @@ local_policy = LocalPolicy()
 
 from uagents import Agent, Context  # noqa: E402
 
+# uvloop (optional, not available on Windows) is used only when the connector
+# runs as a program, never as an import side effect.  The Agent takes its
+# loop at construction, so the loop is made here and passed in.
+_event_loop = None
+if __name__ == "__main__":
+    try:
+        import uvloop  # noqa: E402
+    except ImportError:
+        pass
+    else:
+        _event_loop = uvloop.new_event_loop()
+        logger.info("Using uvloop event loop")
+
 _CONNECTOR_SEED = os.getenv("CONNECTOR_AGENT_SEED", "openclaw-connector-dev-seed")
 _NETWORK = os.getenv("AGENT_NETWORK", "testnet")  # testnet by default
 
@@ -79,6 +94,7 @@ connector_agent = Agent(
     port=int(os.getenv("CONNECTOR_PORT", "8199")),
     endpoint=[f"http://{os.getenv('CONNECTOR_HOST', '127.0.0.1')}:{os.getenv('CONNECTOR_PORT', '8199')}/submit"],
     network=_NETWORK,
+    loop=_event_loop,
 )
 
 # ---------------------------------------------------------------------------
@@ -160,7 +176,6 @@ async def handle_task_dispatch(ctx: Context, sender: str, msg: TaskDispatchReque
     """
     Core handler: verify → policy check → execute → return result.
     """
-    from connector.executor import execute_plan
     from shared.schemas import RejectionReason, TaskPlan, TaskStatus
 
     ctx.logger.info(
@@ -181,7 +196,7 @@ async def handle_task_dispatch(ctx: Context, sender: str, msg: TaskDispatchReque
         return
 
     # 2. Verify signature
-    ok, reason = authenticator.verify_dispatch(msg.task_plan_json, msg.signature)
+    ok, reason, plan_dict = authenticator.verify_dispatch(msg.task_plan_json, msg.signature)
     if not ok:
         ctx.logger.warning("Signature verification failed")
         await ctx.send(
@@ -194,38 +209,43 @@ async def handle_task_dispatch(ctx: Context, sender: str, msg: TaskDispatchReque
         )
         return
 
-    # 3. Deserialise plan
-    try:
-        plan = TaskPlan.model_validate_json(msg.task_plan_json)
-    except Exception as exc:
-        ctx.logger.error("Invalid task plan JSON: %s", exc)
+    # 3. Local policy check on the raw dict (cheap reject before validation)
+    policy_rejection = (
+        local_policy.validate_dict(plan_dict)
+        if isinstance(plan_dict, dict)
+        else RejectionReason.POLICY_VIOLATION
+    )
+    if policy_rejection is not None:
+        ctx.logger.warning("Local policy rejected plan: %s", policy_rejection.value)
+        task_id = plan_dict.get("task_id") if isinstance(plan_dict, dict) else ""
         await ctx.send(
             sender,
             TaskExecutionResult(
-                task_id="",
+                task_id=task_id if isinstance(task_id, str) else "",
                 status=TaskStatus.REJECTED.value,
-                reason=RejectionReason.POLICY_VIOLATION.value,
+                reason=policy_rejection.value,
             ),
         )
         return
 
-    # 4. Local policy check
-    policy_rejection = local_policy.validate_plan(plan)
-    if policy_rejection is not None:
-        ctx.logger.warning("Local policy rejected plan: %s", policy_rejection.value)
+    # 4. Deserialise plan (reuse the dict parsed during verification)
+    try:
+        plan = TaskPlan.model_validate(plan_dict)
+    except Exception as exc:
+        ctx.logger.error("Invalid task plan JSON: %s", exc)
         await ctx.send(
             sender,
             TaskExecutionResult(
-                task_id=plan.task_id,
+                task_id="",
                 status=TaskStatus.REJECTED.value,
-                reason=policy_rejection.value,
+                reason=RejectionReason.POLICY_VIOLATION.value,
             ),
         )
         return
 
-    # 5. Execute
+    # 5. Execute (off the event loop so other messages keep flowing)
     ctx.logger.info("Executing task plan %s (%d steps)", plan.task_id, len(plan.steps))
-    result = execute_plan(plan)
+    result = await asyncio.to_thread(execute_plan, plan)
 
     # 6. Return result
     await ctx.send(
@@ -233,9 +253,7 @@ async def handle_task_dispatch(ctx: Context, sender: str, msg: TaskDispatchReque
         TaskExecutionResult(
             task_id=result.task_id,
             status=result.status.value,
-            step_results_json=json.dumps(
-                [sr.model_dump(mode="json") for sr in result.step_results]
-            ),
+            step_results_json=fastjson.dumps(result.step_results),
             outputs=result.outputs,
             reason=result.reason.value if result.reason else "",
         ),
@@ -7,13 +7,14 @@ repository into a temporary sandbox, runs static analysis tools
 health report.
 
 Actions:
-    1. clone_repo          - shallow-clone a public repo into a temp dir
+    1. clone_repo          - partial-clone a public repo into a temp dir
     2. analyze_repo        - run cloc, dependency audit, git stats
     3. generate_health_report - compile everything into a scored report
 
 Security:
     - Only PUBLIC repos are cloned (SSH URLs rejected).
-    - Clone uses ``--depth 1`` (shallow) to limit data transfer.
+    - Clone is depth-limited and blob-less (``--filter=blob:none``) to
+      limit data transfer.
     - Max repo size enforced (default 500 MB).
     - All work happens in a temporary directory that is deleted after.
     - NO code from the cloned repo is ever imported or executed.
@@ -22,24 +23,41 @@ Security:
 
 from __future__ import annotations
 
+import copy
+import heapq
 import logging
 import os
 import re
 import shutil
+import stat
 import subprocess
 import tempfile
-from datetime import datetime, timezone
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any
 
+try:
+    import pygit2  # optional: read git history in-process
+except ImportError:
+    pygit2 = None
+
 logger = logging.getLogger(__name__)
 
 # Maximum repo size in MB before we abort
 _MAX_REPO_SIZE_MB = int(os.getenv("MAX_REPO_SIZE_MB", "500"))
 
-# Regex for valid GitHub HTTPS URLs
+# Commits of history fetched for stats; older history is never downloaded
+_CLONE_HISTORY_DEPTH = int(os.getenv("CLONE_HISTORY_DEPTH", "500"))
+
+# Regex for valid GitHub HTTPS URLs (use with fullmatch).  Lengths follow
+# GitHub's own limits and keep matching linear on hostile input.
 _GITHUB_URL_RE = re.compile(
-    r"^https://github\.com/[\w.\-]+/[\w.\-]+(\.git)?/?$"
+    r"https://github\.com/(?P<owner>[A-Za-z0-9._-]{1,39})/(?P<repo>[A-Za-z0-9._-]{1,100}?)(?:\.git)?"
 )
 
 # ---------------------------------------------------------------------------
@@ -61,21 +79,208 @@ def _run(cmd: list[str], cwd: str | None = None, timeout: int = 120) -> subproce
 def _dir_size_mb(path: str) -> float:
     """Return total directory size in MB."""
     total = 0
-    for dirpath, _dirnames, filenames in os.walk(path):
-        for f in filenames:
-            fp = os.path.join(dirpath, f)
-            if os.path.isfile(fp):
-                total += os.path.getsize(fp)
+    stack = [path]
+    while stack:
+        try:
+            entries = list(os.scandir(stack.pop()))
+        except OSError:
+            continue
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file():
+                    total += entry.stat().st_size
+            except OSError:
+                continue
     return total / (1024 * 1024)
 
 
-def _count_lines_by_language(repo_path: str) -> dict[str, int]:
-    """Count lines of code by language using simple heuristics.
+# Fallback extension -> language map used when cloc is unavailable
+_EXT_MAP: dict[str, str] = {
+    ".py": "Python", ".js": "JavaScript", ".ts": "TypeScript",
+    ".jsx": "JavaScript (JSX)", ".tsx": "TypeScript (TSX)",
+    ".java": "Java", ".go": "Go", ".rs": "Rust",
+    ".rb": "Ruby", ".php": "PHP", ".c": "C", ".cpp": "C++",
+    ".h": "C/C++ Header", ".cs": "C#", ".swift": "Swift",
+    ".kt": "Kotlin", ".scala": "Scala", ".sh": "Shell",
+    ".html": "HTML", ".css": "CSS", ".scss": "SCSS",
+    ".json": "JSON", ".yml": "YAML", ".yaml": "YAML",
+    ".md": "Markdown", ".sql": "SQL", ".r": "R",
+    ".dart": "Dart", ".lua": "Lua", ".vue": "Vue",
+}
+
+# Source files recognised by name because they have no extension
+_NAME_MAP: dict[str, str] = {
+    "Dockerfile": "Dockerfile", "Makefile": "Makefile",
+    "Rakefile": "Ruby", "Gemfile": "Ruby", "Jenkinsfile": "Groovy",
+}
+
+# Directories skipped when counting source files/lines (hidden dirs too)
+_NON_SOURCE_DIRS = frozenset({"node_modules", "vendor", "__pycache__", ".git", "dist", "build"})
+
+# VCS metadata: nothing in here is part of the working tree, so the walk
+# never descends into these
+_VCS_DIRS = frozenset({".git", ".hg", ".svn"})
+
+# Installed dependencies, caches, editor settings and build output: left
+# out of the source and test counts.  The secrets check still looks inside,
+# since that is where credentials tend to get committed by accident.
+_PRUNE_DIRS = frozenset({
+    "node_modules", "__pycache__", ".venv", "venv", ".tox", ".mypy_cache",
+    ".pytest_cache", "dist", "build", ".idea", ".vscode",
+})
+
+_TEST_PATTERNS = ("test_", "_test.", ".test.", ".spec.", "tests/", "test/")
+# File names never contain "/", so only these patterns can match one
+_TEST_NAME_PATTERNS = tuple(pat for pat in _TEST_PATTERNS if "/" not in pat)
+
+_SUSPICIOUS_NAME_PARTS = (".env", "secret", "credentials", "private_key", ".pem")
+# One regex search per name instead of a substring test per part
+_SUSPICIOUS_NAME_RE = re.compile("|".join(map(re.escape, _SUSPICIOUS_NAME_PARTS)))
+
+
+@dataclass
+class _RepoScan:
+    """Everything gathered from a single traversal of the working tree."""
+
+    source_files: list[tuple[str, str]] = field(default_factory=list)  # (path, language)
+    total_files: int = 0
+    total_dirs: int = 0
+    extensions: Counter[str] = field(default_factory=Counter)
+    test_files: int = 0
+    suspicious_files: list[str] = field(default_factory=list)
+    root_entries: set[str] = field(default_factory=set)  # names directly under the repo root
+
+
+def _scan_repo(repo_path: str) -> _RepoScan:
+    """Walk *repo_path* once and collect the inputs of every file-based check.
+
+    VCS metadata directories are never entered.  Beyond that each check
+    keeps its own pruning rules: source/file counts skip hidden, vendored
+    and ``_PRUNE_DIRS`` directories, test detection skips hidden and
+    ``_PRUNE_DIRS`` directories, and the secrets check looks everywhere.
+    """
+    scan = _RepoScan()
+    # (absolute dir, dir relative to the repo with trailing "/", in source walk, in test walk)
+    stack: list[tuple[str, str, bool, bool]] = [(repo_path, "", True, True)]
+
+    while stack:
+        dirpath, rel_dir, in_source, in_tests = stack.pop()
+        try:
+            entries = list(os.scandir(dirpath))
+        except OSError:
+            continue
+        # Every test file under a test-looking directory counts, so the
+        # directory is matched once rather than once per file
+        dir_is_test = in_tests and any(pat in rel_dir.lower() for pat in _TEST_PATTERNS)
+        if not rel_dir:
+            scan.root_entries = {entry.name for entry in entries}
+
+        for entry in entries:
+            name = entry.name
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
 
-    We attempt ``cloc`` first (if installed). If unavailable, we fall
-    back to counting by file extension.
+            if is_dir:
+                if name in _VCS_DIRS:
+                    continue
+                counted = not name.startswith(".") and name not in _PRUNE_DIRS
+                child_source = in_source and counted and name not in _NON_SOURCE_DIRS
+                child_tests = in_tests and counted
+                if child_source:
+                    scan.total_dirs += 1
+                # Like os.walk, list symlinked dirs but never descend into them
+                if not entry.is_symlink():
+                    stack.append((entry.path, f"{rel_dir}{name}/", child_source, child_tests))
+                continue
+
+            lower = name.lower()
+
+            if _SUSPICIOUS_NAME_RE.search(lower):
+                if not lower.endswith((".example", ".sample")):
+                    scan.suspicious_files.append(rel_dir + name)
+
+            if in_source:
+                # Same rule as Path.suffix, without building a Path per file
+                dot = name.rfind(".")
+                suffix = name[dot:].lower() if 0 < dot < len(name) - 1 else ""
+                lang = _EXT_MAP.get(suffix) if suffix else _NAME_MAP.get(name)
+                if lang:
+                    scan.source_files.append((entry.path, lang))
+                if not name.startswith("."):
+                    scan.total_files += 1
+                    ext = suffix or "(no extension)"
+                    scan.extensions[ext] += 1
+
+            if dir_is_test or (in_tests and any(pat in lower for pat in _TEST_NAME_PATTERNS)):
+                scan.test_files += 1
+
+    return scan
+
+
+_READ_CHUNK = 1 << 20
+
+# Source files larger than this are generated or minified (bundles, data
+# dumps); reading them costs far more than the handful of lines they add
+_MAX_COUNT_BYTES = int(os.getenv("MAX_COUNT_FILE_KB", "1024")) * 1024
+
+# Below this many files a thread pool costs more than it saves
+_PARALLEL_COUNT_MIN_FILES = 64
+_COUNT_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+_O_NOATIME = getattr(os, "O_NOATIME", 0)
+
+
+def _count_file_lines(path: str) -> int | None:
+    """Count lines by scanning raw bytes for newlines (no text decoding).
+
+    A final line without a trailing newline still counts as a line.
+    Returns *None* without reading files over ``_MAX_COUNT_BYTES``.
     """
-    # Try cloc
+    try:
+        fd = os.open(path, os.O_RDONLY | _O_NOATIME)
+    except PermissionError:
+        # O_NOATIME is only allowed for files we own
+        fd = os.open(path, os.O_RDONLY)
+    try:
+        if os.fstat(fd).st_size > _MAX_COUNT_BYTES:
+            return None
+        count = 0
+        last = b""
+        while chunk := os.read(fd, _READ_CHUNK):
+            count += chunk.count(b"\n")
+            last = chunk
+    finally:
+        os.close(fd)
+    if last and not last.endswith(b"\n"):
+        count += 1
+    return count
+
+
+def _safe_count_file_lines(path: str) -> int | None:
+    try:
+        return _count_file_lines(path)
+    except OSError:
+        return None
+
+
+def _root_entries(repo_path: str) -> set[str]:
+    """Names directly under *repo_path*, from one directory read.
+
+    Config-file checks test membership here instead of stat-ing each
+    candidate path.
+    """
+    try:
+        with os.scandir(repo_path) as it:
+            return {entry.name for entry in it}
+    except OSError:
+        return set()
+
+
+def _cloc_languages(repo_path: str) -> dict[str, int] | None:
+    """Lines of code per language from ``cloc``, or *None* if unavailable."""
     try:
         result = _run(["cloc", "--json", "--quiet", repo_path], timeout=60)
         if result.returncode == 0:
@@ -93,106 +298,181 @@ def _count_lines_by_language(repo_path: str) -> dict[str, int]:
         logger.debug("cloc not installed, using extension-based counting")
     except Exception as exc:
         logger.debug("cloc failed: %s, falling back", exc)
+    return None
 
-    # Fallback: count by extension
-    ext_map: dict[str, str] = {
-        ".py": "Python", ".js": "JavaScript", ".ts": "TypeScript",
-        ".jsx": "JavaScript (JSX)", ".tsx": "TypeScript (TSX)",
-        ".java": "Java", ".go": "Go", ".rs": "Rust",
-        ".rb": "Ruby", ".php": "PHP", ".c": "C", ".cpp": "C++",
-        ".h": "C/C++ Header", ".cs": "C#", ".swift": "Swift",
-        ".kt": "Kotlin", ".scala": "Scala", ".sh": "Shell",
-        ".html": "HTML", ".css": "CSS", ".scss": "SCSS",
-        ".json": "JSON", ".yml": "YAML", ".yaml": "YAML",
-        ".md": "Markdown", ".sql": "SQL", ".r": "R",
-        ".dart": "Dart", ".lua": "Lua", ".vue": "Vue",
-    }
-    languages: dict[str, int] = {}
-    for dirpath, dirnames, filenames in os.walk(repo_path):
-        # Skip hidden directories and common non-source dirs
-        dirnames[:] = [
-            d for d in dirnames
-            if not d.startswith(".") and d not in ("node_modules", "vendor", "__pycache__", ".git", "dist", "build")
-        ]
-        for fname in filenames:
-            ext = Path(fname).suffix.lower()
-            lang = ext_map.get(ext)
-            if lang:
-                fpath = os.path.join(dirpath, fname)
-                try:
-                    with open(fpath, "r", errors="ignore") as f:
-                        line_count = sum(1 for _ in f)
-                    languages[lang] = languages.get(lang, 0) + line_count
-                except Exception:
-                    pass
-
-    return dict(sorted(languages.items(), key=lambda x: -x[1]))
-
-
-def _count_files(repo_path: str) -> dict[str, int]:
+
+def _count_lines_by_language(repo_path: str, scan: _RepoScan | None = None) -> dict[str, int]:
+    """Count lines of code by language using simple heuristics.
+
+    We attempt ``cloc`` first (if installed). If unavailable, we fall
+    back to counting by file extension.
+    """
+    languages = _cloc_languages(repo_path)
+    if languages:
+        return languages
+    if scan is None:
+        scan = _scan_repo(repo_path)
+    return _fallback_line_counts(scan)
+
+
+def _fallback_line_counts(scan: _RepoScan) -> dict[str, int]:
+    """Per-language line counts for *scan*'s source files, used without cloc.
+
+    Languages come from the file extension, or the name for files such as
+    ``Dockerfile``.
+    """
+    files = scan.source_files
+    if len(files) >= _PARALLEL_COUNT_MIN_FILES:
+        # Reads release the GIL, so threads overlap filesystem latency
+        with ThreadPoolExecutor(max_workers=_COUNT_WORKERS) as pool:
+            counts = list(pool.map(_safe_count_file_lines, [fpath for fpath, _ in files]))
+    else:
+        counts = [_safe_count_file_lines(fpath) for fpath, _ in files]
+
+    languages: Counter[str] = Counter()
+    for (_, lang), line_count in zip(files, counts):
+        if line_count is not None:
+            languages[lang] += line_count
+
+    return dict(languages.most_common())
+
+
+def _count_files(repo_path: str, scan: _RepoScan | None = None) -> dict[str, int]:
     """Count total files, directories, and file types."""
-    total_files = 0
-    total_dirs = 0
-    extensions: dict[str, int] = {}
-    for dirpath, dirnames, filenames in os.walk(repo_path):
-        dirnames[:] = [
-            d for d in dirnames
-            if not d.startswith(".") and d not in ("node_modules", "vendor", "__pycache__", "dist", "build")
-        ]
-        total_dirs += len(dirnames)
-        for fname in filenames:
-            if not fname.startswith("."):
-                total_files += 1
-                ext = Path(fname).suffix.lower() or "(no extension)"
-                extensions[ext] = extensions.get(ext, 0) + 1
+    if scan is None:
+        scan = _scan_repo(repo_path)
     return {
-        "total_files": total_files,
-        "total_dirs": total_dirs,
-        "top_extensions": dict(sorted(extensions.items(), key=lambda x: -x[1])[:10]),
+        "total_files": scan.total_files,
+        "total_dirs": scan.total_dirs,
+        "top_extensions": dict(scan.extensions.most_common(10)),
     }
 
 
 def _git_stats(repo_path: str) -> dict[str, Any]:
-    """Gather git statistics: commits, contributors, recent activity."""
-    stats: dict[str, Any] = {}
+    """Gather git statistics: commits, contributors, recent activity.
+
+    Uses libgit2 in-process when ``pygit2`` is installed; otherwise
+    everything except the branch name comes from a single ``git log``
+    over HEAD, aggregated in Python.
+    """
+    if pygit2 is not None:
+        try:
+            return _git_stats_pygit2(repo_path)
+        except (pygit2.GitError, KeyError, ValueError) as exc:
+            logger.debug("pygit2 stats failed: %s, falling back to git", exc)
 
-    # Total commits
-    result = _run(["git", "-C", repo_path, "rev-list", "--count", "HEAD"], timeout=30)
-    stats["total_commits"] = int(result.stdout.strip()) if result.returncode == 0 else 0
+    stats = _empty_git_stats()
 
-    # Commits in last 30 days
     result = _run(
-        ["git", "-C", repo_path, "rev-list", "--count", "--since=30 days ago", "HEAD"],
-        timeout=30,
+        ["git", "-C", repo_path, "log", "--use-mailmap", "--format=%ct%x09%ci%x09%aN", "HEAD"],
+        timeout=60,
     )
-    stats["commits_last_30_days"] = int(result.stdout.strip()) if result.returncode == 0 else 0
-
-    # Contributors
-    result = _run(["git", "-C", repo_path, "shortlog", "-sn", "--all"], timeout=30)
     if result.returncode == 0:
-        contributors = []
-        for line in result.stdout.strip().splitlines()[:10]:
-            parts = line.strip().split("\t", 1)
-            if len(parts) == 2:
-                contributors.append({"commits": int(parts[0].strip()), "name": parts[1].strip()})
-        stats["top_contributors"] = contributors
-        stats["total_contributors"] = len(result.stdout.strip().splitlines())
-    else:
-        stats["top_contributors"] = []
-        stats["total_contributors"] = 0
+        cutoff = time.time() - 30 * 24 * 60 * 60
+        authors: Counter[str] = Counter()
+        total = recent = 0
+        latest: str | None = None
+        for line in result.stdout.splitlines():
+            parts = line.split("\t", 2)
+            if len(parts) != 3:
+                continue
+            timestamp, date, author = parts
+            total += 1
+            if latest is None:
+                latest = date  # newest first, i.e. HEAD itself
+            if int(timestamp) >= cutoff:
+                recent += 1
+            authors[author.strip()] += 1
+        _fill_log_stats(stats, total, recent, authors, latest)
+
+    # Depth-limited clones leave a shallow boundary; totals are then lower bounds
+    stats["history_truncated"] = os.path.exists(os.path.join(repo_path, ".git", "shallow"))
+
+    stats["default_branch"] = _head_branch(repo_path)
+
+    return stats
+
+
+_HEAD_REF_PREFIX = "ref: refs/heads/"
 
-    # Latest commit date
-    result = _run(["git", "-C", repo_path, "log", "-1", "--format=%ci"], timeout=10)
-    stats["latest_commit_date"] = result.stdout.strip() if result.returncode == 0 else "unknown"
 
-    # Default branch
-    result = _run(["git", "-C", repo_path, "symbolic-ref", "--short", "HEAD"], timeout=10)
-    stats["default_branch"] = result.stdout.strip() if result.returncode == 0 else "unknown"
+def _head_branch(repo_path: str) -> str:
+    """Branch HEAD points at, or ``"unknown"`` when detached.
 
+    Read straight from ``.git/HEAD`` so the fallback stats need only the
+    one ``git log`` process; ``git symbolic-ref`` covers layouts where
+    ``.git`` is not a directory (worktrees, submodules).
+    """
+    try:
+        with open(os.path.join(repo_path, ".git", "HEAD")) as fh:
+            head = fh.read().strip()
+    except OSError:
+        result = _run(["git", "-C", repo_path, "symbolic-ref", "--short", "HEAD"], timeout=10)
+        return result.stdout.strip() if result.returncode == 0 else "unknown"
+    if head.startswith(_HEAD_REF_PREFIX):
+        return head[len(_HEAD_REF_PREFIX):]
+    return "unknown"
+
+
+def _empty_git_stats() -> dict[str, Any]:
+    return {
+        "total_commits": 0,
+        "commits_last_30_days": 0,
+        "top_contributors": [],
+        "total_contributors": 0,
+        "latest_commit_date": "unknown",
+    }
+
+
+def _fill_log_stats(
+    stats: dict[str, Any], total: int, recent: int, authors: Counter[str], latest: str | None
+) -> None:
+    # Only the top 10 are reported, so select them without sorting everyone
+    top = heapq.nsmallest(10, authors.items(), key=lambda item: (-item[1], item[0]))
+    stats["total_commits"] = total
+    stats["commits_last_30_days"] = recent
+    stats["top_contributors"] = [
+        {"commits": count, "name": name} for name, count in top
+    ]
+    stats["total_contributors"] = len(authors)
+    if latest is not None:
+        stats["latest_commit_date"] = latest
+
+
+def _git_stats_pygit2(repo_path: str) -> dict[str, Any]:
+    """:func:`_git_stats` via libgit2, with the same output as ``git log``."""
+    repo = pygit2.Repository(repo_path)
+    stats = _empty_git_stats()
+    head = repo.head  # raises GitError on an unborn branch
+
+    try:
+        mailmap = pygit2.Mailmap.from_repository(repo)
+    except pygit2.GitError:
+        mailmap = None
+
+    cutoff = time.time() - 30 * 24 * 60 * 60
+    authors: Counter[str] = Counter()
+    total = recent = 0
+    for commit in repo.walk(head.target):
+        total += 1
+        if commit.commit_time >= cutoff:
+            recent += 1
+        author = commit.author
+        if mailmap is not None:
+            author = mailmap.resolve_signature(author)
+        authors[author.name.strip()] += 1
+
+    head_commit = repo[head.target]
+    tz = timezone(timedelta(minutes=head_commit.commit_time_offset))
+    latest = datetime.fromtimestamp(head_commit.commit_time, tz).strftime("%Y-%m-%d %H:%M:%S %z")
+    _fill_log_stats(stats, total, recent, authors, latest)
+
+    stats["history_truncated"] = repo.is_shallow
+    stats["default_branch"] = "unknown" if repo.head_is_detached else head.shorthand
     return stats
 
 
-def _detect_tests(repo_path: str) -> dict[str, Any]:
+def _detect_tests(repo_path: str, scan: _RepoScan | None = None) -> dict[str, Any]:
     """Detect testing frameworks by looking for test files and configs."""
     test_info: dict[str, Any] = {"frameworks": [], "test_files": 0}
 
@@ -205,18 +485,16 @@ def _detect_tests(repo_path: str) -> dict[str, Any]:
         "build.gradle": "JUnit/Gradle", "pom.xml": "JUnit/Maven",
         "Cargo.toml": "cargo test",
     }
+    if scan is None:
+        scan = _scan_repo(repo_path)
+    root_entries = scan.root_entries
     for cfg_file, framework in configs.items():
-        if (Path(repo_path) / cfg_file).exists():
+        if cfg_file in root_entries:
             if framework not in test_info["frameworks"]:
                 test_info["frameworks"].append(framework)
 
     # Count test files
-    test_patterns = ["test_", "_test.", ".test.", ".spec.", "tests/", "test/"]
-    for dirpath, dirnames, filenames in os.walk(repo_path):
-        dirnames[:] = [d for d in dirnames if not d.startswith(".") and d != "node_modules"]
-        for fname in filenames:
-            if any(pat in fname.lower() or pat in dirpath.lower() for pat in test_patterns):
-                test_info["test_files"] += 1
+    test_info["test_files"] = scan.test_files
 
     return test_info
 
@@ -240,9 +518,10 @@ def _check_dependencies(repo_path: str) -> dict[str, Any]:
         "composer.json": "Composer (PHP)",
     }
 
+    root_entries = _root_entries(repo_path)
     for dep_file, manager in dep_files.items():
-        fpath = Path(repo_path) / dep_file
-        if fpath.exists():
+        if dep_file in root_entries:
+            fpath = Path(repo_path) / dep_file
             dep_info["files_found"].append(dep_file)
             try:
                 content = fpath.read_text(errors="ignore")
@@ -269,36 +548,34 @@ def _check_dependencies(repo_path: str) -> dict[str, Any]:
     return dep_info
 
 
-def _check_security_files(repo_path: str) -> dict[str, Any]:
+def _check_security_files(repo_path: str, scan: _RepoScan | None = None) -> dict[str, Any]:
     """Check for security-related files and configurations."""
     security: dict[str, Any] = {"has_license": False, "has_readme": False, "has_gitignore": False, "findings": []}
 
-    root = Path(repo_path)
+    if scan is None:
+        scan = _scan_repo(repo_path)
+    root = scan.root_entries
+
     security["has_license"] = any(
-        (root / f).exists() for f in ["LICENSE", "LICENSE.md", "LICENSE.txt", "LICENCE"]
+        f in root for f in ["LICENSE", "LICENSE.md", "LICENSE.txt", "LICENCE"]
     )
     security["has_readme"] = any(
-        (root / f).exists() for f in ["README.md", "README.rst", "README.txt", "README"]
+        f in root for f in ["README.md", "README.rst", "README.txt", "README"]
     )
-    security["has_gitignore"] = (root / ".gitignore").exists()
+    security["has_gitignore"] = ".gitignore" in root
     security["has_ci"] = any(
-        (root / d).exists() for d in [".github/workflows", ".gitlab-ci.yml", ".circleci", "Jenkinsfile"]
+        f in root for f in [".gitlab-ci.yml", ".circleci", "Jenkinsfile"]
+    ) or (
+        # Only look inside .github when it exists
+        ".github" in root and os.path.exists(os.path.join(repo_path, ".github", "workflows"))
     )
-    security["has_security_policy"] = (root / "SECURITY.md").exists()
+    security["has_security_policy"] = "SECURITY.md" in root
     security["has_contributing"] = any(
-        (root / f).exists() for f in ["CONTRIBUTING.md", "CONTRIBUTING"]
+        f in root for f in ["CONTRIBUTING.md", "CONTRIBUTING"]
     )
 
     # Check for potential secrets in common files (just filenames, not content)
-    suspicious_files = []
-    for dirpath, _dirnames, filenames in os.walk(repo_path):
-        for fname in filenames:
-            lower = fname.lower()
-            if any(s in lower for s in [".env", "secret", "credentials", "private_key", ".pem"]):
-                if not lower.endswith(".example") and not lower.endswith(".sample"):
-                    rel_path = os.path.relpath(os.path.join(dirpath, fname), repo_path)
-                    if not rel_path.startswith(".git/"):
-                        suspicious_files.append(rel_path)
+    suspicious_files = scan.suspicious_files
     if suspicious_files:
         security["findings"].append(
             f"Potentially sensitive files committed: {', '.join(suspicious_files[:5])}"
@@ -356,6 +633,55 @@ def _compute_health_score(
     return max(0.0, min(10.0, round(score, 1)))
 
 
+# Suffix marking temp trees that are being deleted in the background
+_DELETING_SUFFIX = ".deleting"
+_stale_swept = False
+
+
+def _remove_tree_in_background(path: str) -> None:
+    """Delete *path* on a daemon thread so callers do not wait for it.
+
+    The tree is first renamed with :data:`_DELETING_SUFFIX` so a tree left
+    behind by an interrupted deletion is recognisable and can be swept by
+    :func:`_sweep_stale_trees`.
+    """
+    doomed = path + _DELETING_SUFFIX
+    try:
+        os.rename(path, doomed)
+    except OSError:
+        doomed = path
+    _start_rmtree(doomed)
+
+
+def _start_rmtree(path: str) -> None:
+    threading.Thread(
+        target=shutil.rmtree,
+        args=(path,),
+        kwargs={"ignore_errors": True},
+        name="repo-cleanup",
+        daemon=True,
+    ).start()
+
+
+def _sweep_stale_trees() -> None:
+    """Remove half-deleted analysis trees left by a previous process (once)."""
+    global _stale_swept
+    if _stale_swept:
+        return
+    _stale_swept = True
+    try:
+        with os.scandir(tempfile.gettempdir()) as it:
+            stale = [
+                entry.path for entry in it
+                if entry.name.startswith("repo_analysis_")
+                and entry.name.endswith(_DELETING_SUFFIX)
+            ]
+    except OSError:
+        return
+    for path in stale:
+        _start_rmtree(path)
+
+
 # ---------------------------------------------------------------------------
 # 1. clone_repo
 # ---------------------------------------------------------------------------
@@ -381,19 +707,35 @@ def clone_repo(params: dict[str, Any]) -> dict[str, Any]:
         url_for_clone = url
 
     # Security: only HTTPS GitHub URLs
-    if not _GITHUB_URL_RE.match(url) and not _GITHUB_URL_RE.match(url + ".git"):
+    match = _GITHUB_URL_RE.fullmatch(url)
+    if not match:
         return {
             "error": "Only public GitHub HTTPS URLs are accepted (https://github.com/owner/repo).",
             "url": url,
         }
+    # Known before the clone starts, so progress can name the repo
+    owner, repo_name = match["owner"], match["repo"]
+
+    _sweep_stale_trees()
 
     # Create a temp directory
     tmpdir = tempfile.mkdtemp(prefix="repo_analysis_")
 
     try:
-        logger.info("Cloning %s into %s (shallow)", url, tmpdir)
+        # Only the last _CLONE_HISTORY_DEPTH commits are fetched, and only
+        # the blobs needed to check out HEAD (history is read as metadata)
+        logger.info(
+            "Cloning %s/%s into %s (depth %d, blob-less)",
+            owner, repo_name, tmpdir, _CLONE_HISTORY_DEPTH,
+        )
         result = _run(
-            ["git", "clone", "--depth", "1", url_for_clone, os.path.join(tmpdir, "repo")],
+            [
+                "git", "clone",
+                "--depth", str(_CLONE_HISTORY_DEPTH),
+                "--filter=blob:none",
+                url_for_clone,
+                os.path.join(tmpdir, "repo"),
+            ],
             timeout=120,
         )
 
@@ -409,7 +751,6 @@ def clone_repo(params: dict[str, Any]) -> dict[str, Any]:
 
         repo_path = os.path.join(tmpdir, "repo")
 
-        # For full git stats, unshallow if small enough
         size_mb = _dir_size_mb(repo_path)
         if size_mb > _MAX_REPO_SIZE_MB:
             shutil.rmtree(tmpdir, ignore_errors=True)
@@ -418,14 +759,6 @@ def clone_repo(params: dict[str, Any]) -> dict[str, Any]:
                 "url": url,
             }
 
-        # Fetch full history for stats (but still don't run anything)
-        _run(["git", "-C", repo_path, "fetch", "--unshallow"], timeout=120)
-
-        # Extract owner/repo from URL
-        parts = url.replace("https://github.com/", "").replace(".git", "").split("/")
-        owner = parts[0] if len(parts) > 0 else "unknown"
-        repo_name = parts[1] if len(parts) > 1 else "unknown"
-
         return {
             "url": url,
             "owner": owner,
@@ -443,6 +776,68 @@ def clone_repo(params: dict[str, Any]) -> dict[str, Any]:
         return {"error": f"Clone failed: {exc}", "url": url}
 
 
+# ---------------------------------------------------------------------------
+# Analysis cache
+# ---------------------------------------------------------------------------
+
+# A fresh clone is exactly its HEAD commit, so the commit id keys the
+# analysis.  Entries expire because "last 30 days" activity ages.
+_ANALYSIS_CACHE_TTL = int(os.getenv("ANALYSIS_CACHE_TTL", "86400"))
+# Optional on-disk copy shared between processes (off when unset)
+_ANALYSIS_CACHE_DIR = os.path.expanduser(os.getenv("ANALYSIS_CACHE_DIR", ""))
+_ANALYSIS_CACHE_MAX = 64
+
+_analysis_cache: dict[str, tuple[float, dict[str, Any]]] = {}
+_analysis_cache_lock = threading.Lock()
+
+
+def _head_sha(repo_path: str) -> str | None:
+    try:
+        result = _run(["git", "-C", repo_path, "rev-parse", "--verify", "HEAD"], timeout=10)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    sha = result.stdout.strip()
+    return sha if result.returncode == 0 and re.fullmatch(r"[0-9a-f]{40,64}", sha) else None
+
+
+def _load_cached_analysis(sha: str) -> dict[str, Any] | None:
+    now = time.time()
+    with _analysis_cache_lock:
+        entry = _analysis_cache.get(sha)
+    if entry is None and _ANALYSIS_CACHE_DIR:
+        try:
+            import json
+            with open(os.path.join(_ANALYSIS_CACHE_DIR, f"{sha}.json")) as fh:
+                stored = json.load(fh)
+            entry = (float(stored["stored_at"]), stored["analysis"])
+        except (OSError, ValueError, KeyError, TypeError):
+            entry = None
+    if entry is None or now - entry[0] > _ANALYSIS_CACHE_TTL:
+        return None
+    with _analysis_cache_lock:
+        _analysis_cache[sha] = entry
+    return entry[1]
+
+
+def _store_analysis(sha: str, analysis: dict[str, Any]) -> None:
+    # The caller keeps (and downstream steps may mutate) *analysis*
+    entry = (time.time(), copy.deepcopy(analysis))
+    with _analysis_cache_lock:
+        if sha not in _analysis_cache and len(_analysis_cache) >= _ANALYSIS_CACHE_MAX:
+            _analysis_cache.pop(next(iter(_analysis_cache)))  # oldest first
+        _analysis_cache[sha] = entry
+    if _ANALYSIS_CACHE_DIR:
+        try:
+            import json
+            os.makedirs(_ANALYSIS_CACHE_DIR, exist_ok=True)
+            tmp = os.path.join(_ANALYSIS_CACHE_DIR, f".{sha}.{os.getpid()}.tmp")
+            with open(tmp, "w") as fh:
+                json.dump({"stored_at": entry[0], "analysis": analysis}, fh)
+            os.replace(tmp, os.path.join(_ANALYSIS_CACHE_DIR, f"{sha}.json"))
+        except OSError as exc:
+            logger.debug("Could not persist analysis cache: %s", exc)
+
+
 # ---------------------------------------------------------------------------
 # 2. analyze_repo
 # ---------------------------------------------------------------------------
@@ -463,13 +858,37 @@ def analyze_repo(params: dict[str, Any], clone_output: dict[str, Any] | None = N
     logger.info("Analyzing repository at %s", repo_path)
 
     try:
-        # Run all analyses
-        languages = _count_lines_by_language(repo_path)
-        file_stats = _count_files(repo_path)
-        git_stats = _git_stats(repo_path)
-        tests = _detect_tests(repo_path)
-        deps = _check_dependencies(repo_path)
-        security = _check_security_files(repo_path)
+        clone_fields = {
+            "owner": clone_data.get("owner", "unknown"),
+            "repo_name": clone_data.get("repo_name", "unknown"),
+            "url": clone_data.get("url", ""),
+            "size_mb": clone_data.get("size_mb", 0),
+        }
+
+        # Only fresh clones (which own a tmpdir) are guaranteed to match
+        # their HEAD commit; a caller's working tree may have local edits
+        head_sha = _head_sha(repo_path) if clone_data.get("tmpdir") else None
+        cached = _load_cached_analysis(head_sha) if head_sha else None
+        if cached is not None:
+            logger.info("Reusing analysis of commit %s", head_sha)
+            return {**clone_fields, **copy.deepcopy(cached)}
+
+        # Run all analyses.  cloc, the git subprocesses and the
+        # dependency-file reads overlap with the tree walk; file-based
+        # checks share one walk.
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            cloc_future = pool.submit(_cloc_languages, repo_path)
+            git_future = pool.submit(_git_stats, repo_path)
+            deps_future = pool.submit(_check_dependencies, repo_path)
+
+            scan = _scan_repo(repo_path)
+            languages = cloc_future.result() or _fallback_line_counts(scan)
+            file_stats = _count_files(repo_path, scan)
+            tests = _detect_tests(repo_path, scan)
+            security = _check_security_files(repo_path, scan)
+
+            git_stats = git_future.result()
+            deps = deps_future.result()
 
         # Compute total lines
         total_lines = sum(languages.values())
@@ -483,11 +902,7 @@ def analyze_repo(params: dict[str, Any], clone_output: dict[str, Any] | None = N
 
         health_score = _compute_health_score(languages, git_stats, tests, deps, security, file_stats)
 
-        return {
-            "owner": clone_data.get("owner", "unknown"),
-            "repo_name": clone_data.get("repo_name", "unknown"),
-            "url": clone_data.get("url", ""),
-            "size_mb": clone_data.get("size_mb", 0),
+        analysis = {
             "total_lines": total_lines,
             "languages": lang_percentages,
             "files": file_stats,
@@ -497,17 +912,21 @@ def analyze_repo(params: dict[str, Any], clone_output: dict[str, Any] | None = N
             "security": security,
             "health_score": health_score,
         }
+        if head_sha:
+            _store_analysis(head_sha, analysis)
+
+        return {**clone_fields, **analysis}
 
     except Exception as exc:
         logger.exception("Analysis failed")
         return {"error": f"Analysis failed: {exc}"}
 
     finally:
-        # Clean up the temporary directory
+        # Clean up the temporary directory off the critical path
         tmpdir = clone_data.get("tmpdir")
         if tmpdir and os.path.isdir(tmpdir):
             logger.info("Cleaning up temp directory %s", tmpdir)
-            shutil.rmtree(tmpdir, ignore_errors=True)
+            _remove_tree_in_background(tmpdir)
 
 
 # ---------------------------------------------------------------------------
@@ -544,6 +963,7 @@ def generate_health_report(
     else:
         score_emoji = "D"
 
+    # Each section is built as a list and the report is joined once
     lines = [
         f"# Repo Health Report: {owner}/{repo_name}",
         f"**URL**: {url}",
@@ -555,36 +975,37 @@ def generate_health_report(
     languages = data.get("languages", {})
     if languages:
         lines.append("## Languages")
-        for lang, info in languages.items():
-            lines.append(f"- **{lang}**: {info}")
+        lines.extend(f"- **{lang}**: {info}" for lang, info in languages.items())
         lines.append("")
 
     # Stats
-    total_lines = data.get("total_lines", 0)
     files = data.get("files", {})
-    lines.append("## Project Stats")
-    lines.append(f"- **Total Lines of Code**: {total_lines:,}")
-    lines.append(f"- **Total Files**: {files.get('total_files', 0):,}")
-    lines.append(f"- **Total Directories**: {files.get('total_dirs', 0):,}")
-    lines.append(f"- **Repo Size**: {data.get('size_mb', 0)} MB")
-    lines.append("")
+    lines.extend([
+        "## Project Stats",
+        f"- **Total Lines of Code**: {data.get('total_lines', 0):,}",
+        f"- **Total Files**: {files.get('total_files', 0):,}",
+        f"- **Total Directories**: {files.get('total_dirs', 0):,}",
+        f"- **Repo Size**: {data.get('size_mb', 0)} MB",
+        "",
+    ])
 
     # Git activity
     git = data.get("git", {})
-    lines.append("## Git Activity")
-    lines.append(f"- **Total Commits**: {git.get('total_commits', 0):,}")
-    lines.append(f"- **Commits (last 30 days)**: {git.get('commits_last_30_days', 0)}")
-    lines.append(f"- **Contributors**: {git.get('total_contributors', 0)}")
-    lines.append(f"- **Default Branch**: {git.get('default_branch', 'unknown')}")
-    lines.append(f"- **Latest Commit**: {git.get('latest_commit_date', 'unknown')}")
+    at_least = "+" if git.get("history_truncated") else ""
+    lines.extend([
+        "## Git Activity",
+        f"- **Total Commits**: {git.get('total_commits', 0):,}{at_least}",
+        f"- **Commits (last 30 days)**: {git.get('commits_last_30_days', 0)}",
+        f"- **Contributors**: {git.get('total_contributors', 0)}{at_least}",
+        f"- **Default Branch**: {git.get('default_branch', 'unknown')}",
+        f"- **Latest Commit**: {git.get('latest_commit_date', 'unknown')}",
+    ])
 
     # Top contributors
     contribs = git.get("top_contributors", [])
     if contribs:
-        lines.append("")
-        lines.append("**Top Contributors:**")
-        for c in contribs[:5]:
-            lines.append(f"  - {c['name']} ({c['commits']} commits)")
+        lines.extend(["", "**Top Contributors:**"])
+        lines.extend(f"  - {c['name']} ({c['commits']} commits)" for c in contribs[:5])
     lines.append("")
 
     # Tests
@@ -601,9 +1022,11 @@ def generate_health_report(
     # Dependencies
     deps = data.get("dependencies", {})
     if deps.get("files_found"):
-        lines.append("## Dependencies")
-        lines.append(f"- **Package Files**: {', '.join(deps['files_found'])}")
-        lines.append(f"- **Total Dependencies**: {deps.get('total_dependencies', 'N/A')}")
+        lines.extend([
+            "## Dependencies",
+            f"- **Package Files**: {', '.join(deps['files_found'])}",
+            f"- **Total Dependencies**: {deps.get('total_dependencies', 'N/A')}",
+        ])
         for fname, detail in deps.get("details", {}).items():
             if isinstance(detail, dict):
                 info_parts = [f"{k}: {v}" for k, v in detail.items() if k != "manager"]
@@ -613,7 +1036,6 @@ def generate_health_report(
 
     # Security / Best Practices
     security = data.get("security", {})
-    lines.append("## Best Practices")
     checks = [
         ("README", security.get("has_readme", False)),
         ("LICENSE", security.get("has_license", False)),
@@ -622,22 +1044,23 @@ def generate_health_report(
         ("SECURITY.md", security.get("has_security_policy", False)),
         ("CONTRIBUTING.md", security.get("has_contributing", False)),
     ]
-    for name, present in checks:
-        emoji = "pass" if present else "missing"
-        lines.append(f"- **{name}**: {emoji}")
+    lines.append("## Best Practices")
+    lines.extend(
+        f"- **{name}**: {'pass' if present else 'missing'}" for name, present in checks
+    )
 
     # Security findings
     findings = security.get("findings", [])
     if findings:
-        lines.append("")
-        lines.append("## Security Findings")
-        for finding in findings:
-            lines.append(f"- WARNING: {finding}")
-    lines.append("")
+        lines.extend(["", "## Security Findings"])
+        lines.extend(f"- WARNING: {finding}" for finding in findings)
 
     # Summary
-    lines.append("---")
-    lines.append(f"*Analysis generated at {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M UTC')}*")
+    lines.extend([
+        "",
+        "---",
+        f"*Analysis generated at {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M UTC')}*",
+    ])
 
     report_text = "\n".join(lines)
 
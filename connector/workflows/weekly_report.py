@@ -18,6 +18,7 @@ from __future__ import annotations
 import logging
 import os
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any
@@ -27,6 +28,9 @@ logger = logging.getLogger(__name__)
 # Default scan path — uses demo directory to avoid leaking real data
 _DEFAULT_SCAN_PATH = os.getenv("DEMO_PROJECTS_DIR", "./demo_projects")
 
+# Upper bound on concurrent ``git log`` subprocesses in scan_directory
+_MAX_GIT_WORKERS = 8
+
 
 # ---------------------------------------------------------------------------
 # 1. scan_directory
@@ -53,30 +57,37 @@ def scan_directory(params: dict[str, Any]) -> dict[str, Any]:
         return {"error": f"Path does not exist: {root}", "scanned_path": str(root)}
 
     since = (datetime.now(timezone.utc) - timedelta(days=7)).strftime("%Y-%m-%d")
-    repos: list[dict[str, Any]] = []
-
-    for candidate in sorted(root.iterdir()):
-        git_dir = candidate / ".git"
-        if not git_dir.is_dir():
-            continue
-
-        try:
-            result = subprocess.run(
-                ["git", "-C", str(candidate), "log", f"--since={since}", "--oneline"],
-                capture_output=True,
-                text=True,
-                timeout=10,
-            )
-            commits = [
-                line.strip() for line in result.stdout.strip().splitlines() if line.strip()
-            ]
-            repos.append({"repo": candidate.name, "commits": commits})
-        except Exception as exc:
-            repos.append({"repo": candidate.name, "error": str(exc)})
+
+    candidates = [
+        candidate for candidate in sorted(root.iterdir()) if (candidate / ".git").is_dir()
+    ]
+    if len(candidates) > 1:
+        # Each repo costs one git subprocess; run them side by side
+        with ThreadPoolExecutor(max_workers=min(_MAX_GIT_WORKERS, len(candidates))) as pool:
+            repos = list(pool.map(lambda candidate: _recent_commits(candidate, since), candidates))
+    else:
+        repos = [_recent_commits(candidate, since) for candidate in candidates]
 
     return {"root": str(root), "repos": repos, "since": since}
 
 
+def _recent_commits(candidate: Path, since: str) -> dict[str, Any]:
+    """Return ``{"repo", "commits"}`` for one repository (or ``"error"``)."""
+    try:
+        result = subprocess.run(
+            ["git", "-C", str(candidate), "log", f"--since={since}", "--oneline"],
+            capture_output=True,
+            text=True,
+            timeout=10,
+        )
+        commits = [
+            line.strip() for line in result.stdout.strip().splitlines() if line.strip()
+        ]
+        return {"repo": candidate.name, "commits": commits}
+    except Exception as exc:
+        return {"repo": candidate.name, "error": str(exc)}
+
+
 # ---------------------------------------------------------------------------
 # 2. generate_report
 # ---------------------------------------------------------------------------
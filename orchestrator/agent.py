@@ -22,17 +22,50 @@ from __future__ import annotations
 import logging
 import os
 import sys
+from dataclasses import dataclass, field
 
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# ---------------------------------------------------------------------------
+# Settings
+# ---------------------------------------------------------------------------
+
+
+def _env_flag(name: str, default: str) -> bool:
+    return os.getenv(name, default).lower() in ("1", "true", "yes")
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Agent configuration, read from the environment once at import."""
+
+    log_level: str
+    seed: str | None = field(repr=False)  # secret – keep out of logs
+    network: str
+    port: int
+    use_mailbox: bool
+
+    @classmethod
+    def from_env(cls) -> Settings:
+        return cls(
+            log_level=os.getenv("LOG_LEVEL", "INFO"),
+            seed=os.getenv("ORCHESTRATOR_AGENT_SEED"),
+            network=os.getenv("AGENT_NETWORK", "testnet"),  # testnet by default
+            port=int(os.getenv("ORCHESTRATOR_PORT", "8200")),
+            use_mailbox=_env_flag("USE_MAILBOX", "true"),
+        )
+
+
+SETTINGS = Settings.from_env()
+
 # ---------------------------------------------------------------------------
 # Logging
 # ---------------------------------------------------------------------------
 
 logging.basicConfig(
-    level=os.getenv("LOG_LEVEL", "INFO"),
+    level=SETTINGS.log_level,
     format="%(asctime)s [%(name)s] %(levelname)s: %(message)s",
 )
 logger = logging.getLogger("orchestrator")
@@ -41,6 +74,7 @@ logger = logging.getLogger("orchestrator")
 # Shared singletons (imported by protocol handlers)
 # ---------------------------------------------------------------------------
 
+from orchestrator.planner import describe_llm  # noqa: E402
 from orchestrator.policy import FetchPolicy  # noqa: E402
 from orchestrator.storage import PairingStore  # noqa: E402
 
@@ -50,27 +84,22 @@ fetch_policy = FetchPolicy()
 # Orchestrator signing key (optional – loaded from env)
 orchestrator_private_key = None
 
-_SEED = os.getenv("ORCHESTRATOR_AGENT_SEED")
-_NETWORK = os.getenv("AGENT_NETWORK", "testnet")  # testnet by default
-
 # ---------------------------------------------------------------------------
 # Agent construction
 # ---------------------------------------------------------------------------
 
 from uagents import Agent  # noqa: E402
 
-_USE_MAILBOX = os.getenv("USE_MAILBOX", "true").lower() in ("1", "true", "yes")
-
 agent = Agent(
     name="openclaw-orchestrator",
-    seed=_SEED or "openclaw-orchestrator-dev-seed",
-    port=int(os.getenv("ORCHESTRATOR_PORT", "8200")),
+    seed=SETTINGS.seed or "openclaw-orchestrator-dev-seed",
+    port=SETTINGS.port,
     **({
         "mailbox": True,
-    } if _USE_MAILBOX else {
-        "endpoint": [f"http://127.0.0.1:{os.getenv('ORCHESTRATOR_PORT', '8200')}/submit"],
+    } if SETTINGS.use_mailbox else {
+        "endpoint": [f"http://127.0.0.1:{SETTINGS.port}/submit"],
     }),
-    network=_NETWORK,
+    network=SETTINGS.network,
 )
 
 # ---------------------------------------------------------------------------
@@ -93,11 +122,12 @@ agent.include(objective_protocol, publish_manifest=True)
 async def on_startup(ctx):
     ctx.logger.info("Orchestrator agent started")
     ctx.logger.info("Agent address : %s", agent.address)
-    ctx.logger.info("Network       : %s", _NETWORK)
-    ctx.logger.info("Mailbox       : %s", "enabled (Agentverse relay)" if _USE_MAILBOX else "disabled (local endpoint)")
+    ctx.logger.info("Network       : %s", SETTINGS.network)
+    ctx.logger.info("Port          : %d", SETTINGS.port)
+    ctx.logger.info("Mailbox       : %s", "enabled (Agentverse relay)" if SETTINGS.use_mailbox else "disabled (local endpoint)")
     ctx.logger.info("Protocols     : chat (ASI:One), pairing, objective-intake")
-    llm_status = "ASI:One (%s)" % os.getenv("ASI_ONE_MODEL", "asi1") if os.getenv("ASI_ONE_API_KEY") else "keyword fallback (no ASI_ONE_API_KEY)"
-    ctx.logger.info("Planner       : %s", llm_status)
+    # The planner owns the ASI:One settings; ask it rather than re-reading env
+    ctx.logger.info("Planner       : %s", describe_llm())
 
 
 # ---------------------------------------------------------------------------
@@ -10,13 +10,24 @@ Reference:  https://docs.asi1.ai/documentation/getting-started/overview
 
 from __future__ import annotations
 
-import json
+import asyncio
 import logging
 import os
 import re
+import threading
+import time
+from typing import Any
+
+from pydantic import BaseModel, Field
 
 from shared.schemas import StepType, TaskConstraints, TaskPlan, TaskStep
 
+# Imported at load time so the first objective does not pay for it
+try:
+    from openai import AsyncOpenAI, BadRequestError
+except ImportError:  # keyword planning still works without it
+    AsyncOpenAI = BadRequestError = None
+
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
@@ -26,31 +37,57 @@ logger = logging.getLogger(__name__)
 _ASI_ONE_API_KEY = os.getenv("ASI_ONE_API_KEY", "")
 _ASI_ONE_BASE_URL = os.getenv("ASI_ONE_BASE_URL", "https://api.asi1.ai/v1")
 _ASI_ONE_MODEL = os.getenv("ASI_ONE_MODEL", "asi1")
+# Ask for a bare JSON object (OpenAI-style JSON mode); disable for
+# endpoints that reject ``response_format``
+_ASI_ONE_JSON_MODE = os.getenv("ASI_ONE_JSON_MODE", "true").lower() in ("1", "true", "yes")
+# Set once the endpoint has rejected ``response_format``
+_json_mode_rejected = False
 
-_openai_client = None
+_async_openai_client = None
 
 
-def _get_llm_client():
-    """Return an OpenAI-compatible client pointed at ASI:One, or None."""
-    global _openai_client
-    if _openai_client is not None:
-        return _openai_client
+def _get_async_llm_client():
+    """Return an async OpenAI-compatible client pointed at ASI:One, or None."""
+    global _async_openai_client
+    if _async_openai_client is not None:
+        return _async_openai_client
     if not _ASI_ONE_API_KEY:
         return None
+    if AsyncOpenAI is None:
+        logger.warning("openai package not installed – using keyword planner")
+        return None
     try:
-        from openai import OpenAI
-
-        _openai_client = OpenAI(
+        _async_openai_client = AsyncOpenAI(
             api_key=_ASI_ONE_API_KEY,
             base_url=_ASI_ONE_BASE_URL,
         )
-        logger.info("ASI:One LLM client initialised (%s)", _ASI_ONE_BASE_URL)
-        return _openai_client
+        logger.info("ASI:One async LLM client initialised (%s)", _ASI_ONE_BASE_URL)
+        return _async_openai_client
     except Exception as exc:
-        logger.warning("Failed to initialise ASI:One LLM client: %s", exc)
+        logger.warning("Failed to initialise ASI:One async LLM client: %s", exc)
         return None
 
 
+def init_llm_client() -> bool:
+    """
+    Create the async ASI:One client up front (called at agent startup).
+
+    The first objective then does not pay for client construction, and a
+    misconfiguration shows up in the startup log.  Returns True if a
+    client is available.
+    """
+    return _get_async_llm_client() is not None
+
+
+def describe_llm() -> str:
+    """Create the ASI:One client (see :func:`init_llm_client`) and describe the planner."""
+    if not _ASI_ONE_API_KEY:
+        return "keyword fallback (no ASI_ONE_API_KEY)"
+    if init_llm_client():
+        return "ASI:One (%s)" % _ASI_ONE_MODEL
+    return "keyword fallback (ASI:One client failed to initialise)"
+
+
 # ---------------------------------------------------------------------------
 # LLM-based planner
 # ---------------------------------------------------------------------------
@@ -101,87 +138,276 @@ Rules:
 """
 
 
-def _plan_with_llm(objective: str) -> TaskPlan | None:
-    """Attempt to plan using ASI:One LLM. Returns None on failure."""
-    client = _get_llm_client()
-    if client is None:
-        return None
+class _LLMStep(BaseModel):
+    type: StepType = StepType.LOCAL
+    action: str
+    params: dict[str, Any] = Field(default_factory=dict)
+
+
+class _LLMConstraints(BaseModel):
+    no_delete: bool = True
+    require_user_confirmation: bool = True
+
+
+class _LLMPlan(BaseModel):
+    """Shape of the plan the system prompt asks the LLM for."""
+    steps: list[_LLMStep] = Field(default_factory=list)
+    constraints: _LLMConstraints = Field(default_factory=_LLMConstraints)
+
 
+def _llm_request(objective: str) -> dict:
+    """Keyword arguments for the chat-completion call planning *objective*."""
+    request = {
+        "model": _ASI_ONE_MODEL,
+        "messages": [
+            {"role": "system", "content": _SYSTEM_PROMPT},
+            {"role": "user", "content": objective},
+        ],
+        "temperature": 0.1,
+        "max_tokens": 512,
+    }
+    if _ASI_ONE_JSON_MODE and not _json_mode_rejected:
+        request["response_format"] = {"type": "json_object"}
+    return request
+
+
+def _rejects_json_mode(exc: Exception) -> bool:
+    """True if *exc* is a 400 about ``response_format`` itself."""
+    if BadRequestError is None or not isinstance(exc, BadRequestError):
+        return False
+    if getattr(exc, "param", None) == "response_format":
+        return True
+    message = str(exc).lower()
+    return any(hint in message for hint in ("response_format", "json_object", "json mode"))
+
+
+def _json_mode_failed(exc: Exception, request: dict) -> bool:
+    """Return True (and stop asking for JSON mode) if *exc* rejected it."""
+    global _json_mode_rejected
+    if "response_format" not in request or not _rejects_json_mode(exc):
+        return False
+    _json_mode_rejected = True
+    logger.warning(
+        "ASI:One rejected response_format (%s) — retrying without JSON mode; "
+        "set ASI_ONE_JSON_MODE=false to skip it", exc,
+    )
+    return True
+
+
+async def _open_llm_stream(client, objective: str):
+    """Start the streamed planning call, retrying once without JSON mode."""
+    request = _llm_request(objective)
     try:
-        response = client.chat.completions.create(
-            model=_ASI_ONE_MODEL,
-            messages=[
-                {"role": "system", "content": _SYSTEM_PROMPT},
-                {"role": "user", "content": objective},
-            ],
-            temperature=0.1,
-            max_tokens=512,
-        )
+        return await client.chat.completions.create(**request, stream=True)
+    except Exception as exc:
+        if not _json_mode_failed(exc, request):
+            raise
+    return await client.chat.completions.create(**_llm_request(objective), stream=True)
+
+
+def _plan_from_llm_content(content: str, objective: str) -> TaskPlan | None:
+    """Build a :class:`TaskPlan` from the LLM's reply text."""
+    raw = content.strip()
+
+    # Strip markdown code fences if present (JSON mode off or ignored)
+    if raw.startswith("```"):
+        # Drop the opening fence line ("```" or "```json") and any closing fence
+        first, newline, rest = raw.partition("\n")
+        raw = rest if newline else first[3:].removeprefix("json")
+        raw = raw.strip()
+        if raw.endswith("```"):
+            raw = raw[:-3].rstrip()
+
+    # One pass parses and validates (pydantic-core's JSON parser)
+    plan_data = _LLMPlan.model_validate_json(raw)
+
+    # Fields were just validated by _LLMStep (type is already a StepType
+    # member), so build the steps without validating them a second time
+    steps = [
+        TaskStep.model_construct(type=s.type, action=s.action, params=s.params)
+        for s in plan_data.steps
+    ]
 
-        raw = response.choices[0].message.content.strip()
+    if not steps:
+        logger.warning("LLM returned zero steps — falling back to keywords")
+        return None
 
-        # Strip markdown code fences if present
-        if raw.startswith("```"):
-            raw = re.sub(r"^```(?:json)?\s*", "", raw)
-            raw = re.sub(r"\s*```$", "", raw)
+    constraints = TaskConstraints(
+        no_delete=plan_data.constraints.no_delete,
+        require_user_confirmation=plan_data.constraints.require_user_confirmation,
+    )
 
-        plan_data = json.loads(raw)
+    plan = TaskPlan(steps=steps, constraints=constraints)
+    logger.info(
+        "LLM planned task %s with %d steps for: %.60s…",
+        plan.task_id,
+        len(steps),
+        objective,
+    )
+    return plan
 
-        steps = []
-        for s in plan_data.get("steps", []):
-            steps.append(
-                TaskStep(
-                    type=StepType(s.get("type", "local")),
-                    action=s["action"],
-                    params=s.get("params", {}),
-                )
-            )
 
-        if not steps:
-            logger.warning("LLM returned zero steps — falling back to keywords")
+# ---------------------------------------------------------------------------
+# LLM reply cache
+# ---------------------------------------------------------------------------
+
+# Replies are cached as text, not as TaskPlans, so every hit still gets a
+# fresh task_id.  Keyed on the objective with whitespace collapsed; case is
+# kept because it can reach step params (e.g. text to summarise).
+_PLAN_CACHE_TTL = float(os.getenv("PLAN_CACHE_TTL", "3600"))
+_PLAN_CACHE_MAX = 512
+
+_plan_cache: dict[str, tuple[float, str]] = {}
+_plan_cache_lock = threading.Lock()
+
+
+def _cache_key(objective: str) -> str:
+    return " ".join(objective.split())
+
+
+def _cached_llm_content(key: str) -> str | None:
+    with _plan_cache_lock:
+        entry = _plan_cache.get(key)
+        if entry is None:
             return None
+        if time.monotonic() - entry[0] > _PLAN_CACHE_TTL:
+            del _plan_cache[key]
+            return None
+        return entry[1]
 
-        constraints_data = plan_data.get("constraints", {})
-        constraints = TaskConstraints(
-            no_delete=constraints_data.get("no_delete", True),
-            require_user_confirmation=constraints_data.get(
-                "require_user_confirmation", True
-            ),
-        )
 
-        plan = TaskPlan(steps=steps, constraints=constraints)
-        logger.info(
-            "LLM planned task %s with %d steps for: %.60s…",
-            plan.task_id,
-            len(steps),
-            objective,
-        )
-        return plan
+def _remember_llm_content(key: str, content: str) -> None:
+    with _plan_cache_lock:
+        _plan_cache.pop(key, None)
+        if len(_plan_cache) >= _PLAN_CACHE_MAX:
+            _plan_cache.pop(next(iter(_plan_cache)))  # oldest first
+        _plan_cache[key] = (time.monotonic(), content)
+
 
+class _PlanStream:
+    """
+    Collect streamed reply text up to the end of the first JSON object.
+
+    Once the top-level object closes, the plan is complete and the rest of
+    the stream (a closing fence, any commentary) need not be waited for.
+    """
+
+    __slots__ = ("chunks", "_depth", "_in_string", "_escape")
+
+    def __init__(self) -> None:
+        self.chunks: list[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, text: str) -> bool:
+        """Add *text*; return True once the top-level object is complete."""
+        for i, ch in enumerate(text):
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self.chunks.append(text[: i + 1])
+                    return True
+        self.chunks.append(text)
+        return False
+
+    @property
+    def content(self) -> str:
+        return "".join(self.chunks)
+
+
+def _chunk_text(chunk) -> str | None:
+    return chunk.choices[0].delta.content if chunk.choices else None
+
+
+# Requests in flight, by cache key: identical objectives arriving together
+# wait for the first one's reply instead of each calling the LLM
+_inflight: dict[str, asyncio.Future[str | None]] = {}
+
+
+async def _aplan_with_llm(objective: str) -> TaskPlan | None:
+    """Attempt to plan using ASI:One LLM. Returns None on failure.
+
+    The HTTP round-trip is awaited, so it does not block the event loop.
+    """
+    client = _get_async_llm_client()
+    if client is None:
+        return None
+
+    key = _cache_key(objective)
+    cached = _cached_llm_content(key)
+    if cached is not None:
+        logger.debug("Reusing cached LLM plan for: %.60s", objective)
+        return _plan_from_llm_content(cached, objective)
+
+    waiting = _inflight.get(key)
+    if waiting is not None:
+        content = await asyncio.shield(waiting)
+        return _plan_from_llm_content(content, objective) if content else None
+
+    future: asyncio.Future[str | None] = asyncio.get_running_loop().create_future()
+    _inflight[key] = future
+    content = None
+    try:
+        collected = _PlanStream()
+        stream = await _open_llm_stream(client, objective)
+        try:
+            async for chunk in stream:
+                text = _chunk_text(chunk)
+                if text and collected.feed(text):
+                    break
+        finally:
+            await stream.close()
+        plan = _plan_from_llm_content(collected.content, objective)
+        if plan is not None:
+            content = collected.content
+            _remember_llm_content(key, content)
+        return plan
     except Exception as exc:
         logger.warning("ASI:One LLM planning failed: %s — falling back to keywords", exc)
         return None
+    finally:
+        # Waiters get the reply only if it produced a plan
+        del _inflight[key]
+        future.set_result(content)
 
 
 # ---------------------------------------------------------------------------
 # Keyword → step templates (fallback)
 # ---------------------------------------------------------------------------
 
-_REPORT_KEYWORDS = re.compile(
-    r"\b(report|summary|summarise|summarize|digest|weekly|daily)\b", re.I
-)
-_SCAN_KEYWORDS = re.compile(
-    r"\b(scan|list|find|search|directory|project)\b", re.I
-)
-_POST_KEYWORDS = re.compile(
-    r"\b(post|send|publish|share|slack|email|notify)\b", re.I
+# Keyword -> the step categories it triggers.  All keywords are matched in
+# one pass over the objective.
+_KEYWORD_CATEGORIES: dict[str, frozenset[str]] = {}
+for _category, _words in (
+    ("report", ("report", "summary", "summarise", "summarize", "digest", "weekly", "daily")),
+    ("scan", ("scan", "list", "find", "search", "directory", "project")),
+    ("post", ("post", "send", "publish", "share", "slack", "email", "notify")),
+    ("analyze", ("analyze", "analyse", "review", "audit", "health", "check", "score", "inspect")),
+    ("repo", ("repo",)),
+    ("email", ("email",)),
+):
+    for _word in _words:
+        _KEYWORD_CATEGORIES[_word] = _KEYWORD_CATEGORIES.get(_word, frozenset()) | {_category}
+del _category, _words, _word
+
+_KEYWORDS_RE = re.compile(
+    r"\b(?:" + "|".join(sorted(_KEYWORD_CATEGORIES, key=len, reverse=True)) + r")\b", re.I
 )
 _GITHUB_URL_RE = re.compile(
     r"https://github\.com/[\w.\-]+/[\w.\-]+"
 )
-_REPO_ANALYZE_KEYWORDS = re.compile(
-    r"\b(analyze|analyse|review|audit|health|check|score|inspect)\b", re.I
-)
 
 
 def _extract_github_url(text: str) -> str | None:
@@ -195,6 +421,14 @@ def _extract_github_url(text: str) -> str | None:
     return None
 
 
+def _keyword_categories(objective: str) -> set[str]:
+    """Return the keyword categories present in *objective*."""
+    categories: set[str] = set()
+    for match in _KEYWORDS_RE.finditer(objective):
+        categories |= _KEYWORD_CATEGORIES[match.group(0).lower()]
+    return categories
+
+
 def _plan_with_keywords(objective: str) -> TaskPlan:
     """Keyword-based fallback planner (no LLM required)."""
     steps: list[TaskStep] = []
@@ -238,8 +472,10 @@ def _plan_with_keywords(objective: str) -> TaskPlan:
         )
         return plan
 
+    categories = _keyword_categories(objective)
+
     # Also match "analyze repo" style without URL (ask for it)
-    if _REPO_ANALYZE_KEYWORDS.search(objective) and re.search(r"\brepo\b", objective, re.I) and not github_url:
+    if "analyze" in categories and "repo" in categories:
         steps.append(
             TaskStep(
                 type=StepType.LOCAL,
@@ -263,7 +499,7 @@ def _plan_with_keywords(objective: str) -> TaskPlan:
         return plan
 
     # 1. Scanning step
-    if _SCAN_KEYWORDS.search(objective):
+    if "scan" in categories:
         steps.append(
             TaskStep(
                 type=StepType.LOCAL,
@@ -273,7 +509,7 @@ def _plan_with_keywords(objective: str) -> TaskPlan:
         )
 
     # 2. Report generation step
-    if _REPORT_KEYWORDS.search(objective):
+    if "report" in categories:
         steps.append(
             TaskStep(
                 type=StepType.LOCAL,
@@ -283,9 +519,9 @@ def _plan_with_keywords(objective: str) -> TaskPlan:
         )
 
     # 3. External posting step
-    if _POST_KEYWORDS.search(objective):
+    if "post" in categories:
         target = "slack"
-        if re.search(r"\bemail\b", objective, re.I):
+        if "email" in categories:
             target = "email"
         steps.append(
             TaskStep(
@@ -327,17 +563,28 @@ def _plan_with_keywords(objective: str) -> TaskPlan:
 
 
 def plan_objective(objective: str) -> TaskPlan:
+    """
+    Convert *objective* into a :class:`TaskPlan` by keyword matching only.
+
+    Synchronous and offline.  Agent handlers and scripts that want the
+    LLM use :func:`aplan_objective`.
+    """
+    return _plan_with_keywords(objective)
+
+
+async def aplan_objective(objective: str) -> TaskPlan:
     """
     Convert a natural-language *objective* into a :class:`TaskPlan`.
 
     Strategy:
       1. Try ASI:One LLM for intelligent planning
       2. Fall back to keyword matching if LLM unavailable or fails
+
+    The LLM call is awaited, so other messages keep being handled while
+    ASI:One generates the plan.
     """
-    # Try LLM first
-    plan = _plan_with_llm(objective)
+    plan = await _aplan_with_llm(objective)
     if plan is not None:
         return plan
 
-    # Fallback to keywords
     return _plan_with_keywords(objective)
@@ -11,7 +11,9 @@ Enforces planning-time rules *before* a task plan is dispatched:
 from __future__ import annotations
 
 import logging
+import threading
 import time
+from collections import deque
 from dataclasses import dataclass, field
 
 from shared.schemas import RejectionReason, TaskPlan
@@ -37,6 +39,9 @@ DEFAULT_ALLOWED_ACTIONS: set[str] = {
 DEFAULT_RATE_LIMIT_PER_MINUTE = 10
 DEFAULT_MAX_STEPS_PER_PLAN = 20
 
+# Rate-limit windows are guarded by one of this many locks, picked by user
+_RATE_LIMIT_LOCK_STRIPES = 16
+
 
 # ---------------------------------------------------------------------------
 # Policy dataclass
@@ -52,10 +57,27 @@ class FetchPolicy:
     rate_limit_per_minute: int = DEFAULT_RATE_LIMIT_PER_MINUTE
     max_steps_per_plan: int = DEFAULT_MAX_STEPS_PER_PLAN
 
-    # simple in-memory sliding-window rate limiter
-    _timestamps: dict[str, list[float]] = field(
+    # frozen copy of allowed_actions for O(1) lookups whatever type was passed
+    _allowed_actions_fs: frozenset[str] = field(
+        default=frozenset(), init=False, repr=False
+    )
+
+    # simple in-memory sliding-window rate limiter; timestamps are appended
+    # in order, so expired ones are always at the left end
+    _timestamps: dict[str, deque[float]] = field(
         default_factory=dict, repr=False
     )
+    # striped locks so concurrent checks for different users rarely contend
+    _rate_locks: tuple[threading.Lock, ...] = field(
+        default_factory=lambda: tuple(
+            threading.Lock() for _ in range(_RATE_LIMIT_LOCK_STRIPES)
+        ),
+        init=False,
+        repr=False,
+    )
+
+    def __post_init__(self) -> None:
+        self._allowed_actions_fs = frozenset(self.allowed_actions)
 
     # ------------------------------------------------------------------
     # Public checks
@@ -63,33 +85,44 @@ class FetchPolicy:
 
     def check_rate_limit(self, user_id: str) -> RejectionReason | None:
         now = time.time()
-        window = self._timestamps.setdefault(user_id, [])
-        # prune outside the 60-second window
-        self._timestamps[user_id] = [
-            ts for ts in window if now - ts < 60
-        ]
-        if len(self._timestamps[user_id]) >= self.rate_limit_per_minute:
+        # prune + count + append must not interleave for one user
+        with self._rate_locks[hash(user_id) % len(self._rate_locks)]:
+            window = self._timestamps.get(user_id)
+            if window is None:
+                window = self._timestamps.setdefault(user_id, deque())
+            # prune outside the 60-second window
+            while window and now - window[0] >= 60:
+                window.popleft()
+            if len(window) >= self.rate_limit_per_minute:
+                exceeded = True
+            else:
+                window.append(now)
+                exceeded = False
+        if exceeded:
             logger.warning("Rate limit exceeded for user %s", user_id)
             return RejectionReason.QUOTA_EXCEEDED
-        self._timestamps[user_id].append(now)
         return None
 
     def check_plan(self, plan: TaskPlan) -> RejectionReason | None:
-        if len(plan.steps) > self.max_steps_per_plan:
+        steps = plan.steps
+        max_steps = self.max_steps_per_plan
+        # O(1) size check first: oversized plans are never walked
+        if len(steps) > max_steps:
             logger.warning(
                 "Plan %s has %d steps (max %d)",
                 plan.task_id,
-                len(plan.steps),
-                self.max_steps_per_plan,
+                len(steps),
+                max_steps,
             )
             return RejectionReason.POLICY_VIOLATION
 
-        for step in plan.steps:
-            if step.action not in self.allowed_actions:
-                logger.warning(
-                    "Action '%s' not in allowlist", step.action
-                )
-                return RejectionReason.ACTION_NOT_ALLOWED
+        allowed = self._allowed_actions_fs
+        bad = next(
+            (step.action for step in steps if step.action not in allowed), None
+        )
+        if bad is not None:
+            logger.warning("Action '%s' not in allowlist", bad)
+            return RejectionReason.ACTION_NOT_ALLOWED
 
         return None
 
@@ -18,14 +18,22 @@ Reference:
 
 from __future__ import annotations
 
-import hashlib
+import asyncio
 import json
 import logging
 import re
 import time
+import weakref
 from datetime import datetime, timezone
+from itertools import islice
 from uuid import uuid4
 
+# pyahocorasick (optional) finds any echo pattern in one pass over the text
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 from uagents import Context, Protocol
 from uagents_core.contrib.protocols.chat import (
     ChatAcknowledgement,
@@ -35,10 +43,11 @@ from uagents_core.contrib.protocols.chat import (
     chat_protocol_spec,
 )
 
-from orchestrator.planner import plan_objective
+from orchestrator.planner import aplan_objective
 from orchestrator.protocols.models import (
     TaskDispatchRequest,
 )
+from shared.crypto import sign_and_serialise
 
 logger = logging.getLogger(__name__)
 
@@ -56,6 +65,9 @@ _MAX_PENDING_TASKS = 5
 # Minimum seconds between processing objectives from the SAME sender.
 _SENDER_COOLDOWN_SECS = 30
 
+# Identical objective text seen again within this window is ignored.
+_DEDUP_WINDOW_SECS = 120
+
 # Regex to strip @agent1q... prefix that ASI:One prepends to messages.
 _AGENT_ADDRESS_PREFIX_RE = re.compile(
     r"^@agent1[qpzry9x8gf2tvdw0s3jn54khce6mua7l]{59}\s*",
@@ -63,32 +75,37 @@ _AGENT_ADDRESS_PREFIX_RE = re.compile(
 
 # Command verbs that indicate a GENUINE user request (imperative form).
 # If the cleaned message starts with one of these, it is never an echo.
-_COMMAND_VERBS_RE = re.compile(
-    r"^(generate|analyze|analyse|review|audit|check|inspect|scan|clone|"
-    r"create|build|run|test|summarize|summarise|compare|look|give|get|"
-    r"show|find|list|tell|explain|help|what|how|can)\b",
-    re.I,
+_COMMAND_VERBS = (
+    "generate", "analyze", "analyse", "review", "audit", "check", "inspect",
+    "scan", "clone", "create", "build", "run", "test", "summarize",
+    "summarise", "compare", "look", "give", "get", "show", "find", "list",
+    "tell", "explain", "help", "what", "how", "can",
 )
+_COMMAND_VERB_SET = frozenset(_COMMAND_VERBS)
+_COMMAND_VERBS_RE = re.compile(r"^(" + "|".join(_COMMAND_VERBS) + r")\b", re.I)
 
 # If the message contains a GitHub URL, it is a genuine request.
 _GITHUB_URL_RE = re.compile(r"https?://github\.com/", re.I)
 
 # Keywords the user would realistically include in a genuine objective.
 # If a message does NOT contain any of these, it is probably an echo.
+_GENUINE_OBJECTIVE_WORDS = frozenset({
+    "generate", "weekly", "report", "analyze", "analyse", "review", "audit",
+    "health", "score", "check", "inspect", "repo", "clone", "scan", "hello",
+    "hi", "help", "what", "how", "create", "build", "run", "test", "summary",
+    "status",
+})
 _GENUINE_OBJECTIVE_KEYWORDS = re.compile(
-    r"\b("
-    r"generate|weekly|report|analyze|analyse|review|audit|health|score|"
-    r"check|inspect|github\.com|repo|clone|scan|hello|hi|help|what|how|"
-    r"create|build|run|test|summary|status"
-    r")\b",
+    r"\b(" + "|".join(sorted(_GENUINE_OBJECTIVE_WORDS)) + r"|github\.com)\b",
     re.I,
 )
+_WORD_RE = re.compile(r"\w+")
 
 # Patterns that indicate the message is an echo of our own response.
 # ASI:One's LLM creatively rewrites our replies and sends them back.
 # IMPORTANT: Do NOT include patterns that overlap with genuine user requests
 # (e.g. "weekly dev report" would block "Generate my weekly dev report").
-_ECHO_PATTERNS = [
+_ECHO_PATTERNS = (
     "task dispatched",
     "task executed",
     "execution complete",
@@ -173,7 +190,29 @@ _ECHO_PATTERNS = [
     "drop your mission",
     "deploy!",
     "no objective detected",
-]
+)
+
+
+# Patterns actually scanned for: one that contains another pattern (e.g.
+# "awaiting execution" / "awaiting exec") can never decide a match
+_ECHO_SCAN_PATTERNS = tuple(
+    p for p in _ECHO_PATTERNS
+    if not any(q != p and q in p for q in _ECHO_PATTERNS)
+)
+
+
+def _build_echo_automaton():
+    """Aho-Corasick automaton over the echo patterns, or None without pyahocorasick."""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for pattern in _ECHO_SCAN_PATTERNS:
+        automaton.add_word(pattern, pattern)
+    automaton.make_automaton()
+    return automaton
+
+
+_ECHO_AUTOMATON = _build_echo_automaton()
 
 # Regex to detect task IDs embedded in messages (our own outputs echoed back)
 _TASK_ID_RE = re.compile(r"task_[0-9a-f]{10,}", re.I)
@@ -202,6 +241,19 @@ async def send_chat_reply(ctx: Context, recipient: str, text: str):
     )
 
 
+_EMPTY: dict = {}
+
+
+def report_text_from_outputs(outputs: dict | None) -> str | None:
+    """Return the weekly or health report text from a task's outputs, if any."""
+    if not outputs:
+        return None
+    return (
+        (outputs.get("generate_report") or _EMPTY).get("report_text")
+        or (outputs.get("generate_health_report") or _EMPTY).get("report_text")
+    )
+
+
 # ---------------------------------------------------------------------------
 # Feedback loop detection helpers
 # ---------------------------------------------------------------------------
@@ -212,6 +264,36 @@ def _clean_objective(text: str) -> str:
     return cleaned
 
 
+def _has_echo_pattern(lower: str) -> bool:
+    """Return True if the lowercased text contains any of _ECHO_PATTERNS."""
+    if _ECHO_AUTOMATON is not None:
+        return next(_ECHO_AUTOMATON.iter(lower), None) is not None
+    # Plain substring checks: one "a|b|c|..." regex over these patterns is
+    # several times slower with CPython's re (alternatives are tried one by
+    # one at every position) and its IGNORECASE folding differs from lower()
+    return any(pattern in lower for pattern in _ECHO_SCAN_PATTERNS)
+
+
+def _has_objective_keyword(cleaned: str, lower: str) -> bool:
+    """Return True if *cleaned* contains one of the genuine objective keywords."""
+    # For ASCII text lower() agrees with re.I and the \w+ runs are exactly
+    # the \b-delimited words, so one set test replaces the alternation scan
+    if cleaned.isascii() and "github.com" not in lower:
+        return not _GENUINE_OBJECTIVE_WORDS.isdisjoint(_WORD_RE.findall(lower))
+    return _GENUINE_OBJECTIVE_KEYWORDS.search(cleaned) is not None
+
+
+def _starts_with_command_verb(cleaned: str, lower: str) -> bool:
+    """Return True if *cleaned* starts with one of _COMMAND_VERBS as a whole word."""
+    if cleaned.isascii():
+        # Cheap tuple prefix test first; the first \w+ run then enforces \b
+        if not lower.startswith(_COMMAND_VERBS):
+            return False
+        first_word = _WORD_RE.match(lower)
+        return first_word is not None and first_word.group() in _COMMAND_VERB_SET
+    return _COMMAND_VERBS_RE.match(cleaned) is not None
+
+
 def _looks_like_echo(text: str) -> bool:
     """Return True if the text appears to be our own response echoed back."""
     # Clean the text first (strip @agent prefix, whitespace)
@@ -221,49 +303,118 @@ def _looks_like_echo(text: str) -> bool:
     # --- GENUINE REQUEST FAST-PATH ---
     # If the cleaned message starts with a command verb, it is a real user
     # request regardless of any echo pattern substring matches.
-    if _COMMAND_VERBS_RE.match(cleaned):
+    if _starts_with_command_verb(cleaned, lower):
         return False
 
-    # If the message contains a GitHub URL, it is a real request.
-    if _GITHUB_URL_RE.search(text):
+    # If the message contains a GitHub URL, it is a real request.  The
+    # case-insensitive scan only runs when a literal "://" is present
+    if "://" in text and _GITHUB_URL_RE.search(text):
         return False
 
     # --- ECHO CHECKS ---
     # Check for known echo patterns
-    if any(pattern in lower for pattern in _ECHO_PATTERNS):
+    if _has_echo_pattern(lower):
         return True
 
-    # Check for embedded task IDs (task_xxxxxxxxxxxx)
-    if _TASK_ID_RE.search(text):
+    # Check for embedded task IDs (task_xxxxxxxxxxxx); a task ID needs a
+    # literal "_", so most messages skip the regex scan entirely
+    if "_" in text and _TASK_ID_RE.search(text):
         return True
 
-    # Messages with 3+ emoji are almost certainly ASI:One's LLM rewrites
-    emoji_count = len(_EMOJI_RE.findall(text))
-    if emoji_count >= 3:
+    # Messages with 3+ emoji are almost certainly ASI:One's LLM rewrites.
+    # Every emoji is non-ASCII and isascii() is O(1), so plain-ASCII
+    # messages skip the scan; otherwise stop at the third emoji
+    if not text.isascii() and len(list(islice(_EMOJI_RE.finditer(text), 3))) == 3:
         return True
 
     # If the message does NOT contain any genuine objective keywords,
     # it is very likely an echo/status message.
-    if not _GENUINE_OBJECTIVE_KEYWORDS.search(cleaned):
+    if not _has_objective_keyword(cleaned, lower):
         return True
 
     return False
 
 
+class _RecentKeys:
+    """Keys with the time they were last marked, forgotten after *ttl* seconds."""
+
+    def __init__(self, ttl: float) -> None:
+        self._ttl = ttl
+        # Re-marked keys move to the end, so the dict stays ordered by time
+        self._seen: dict[str, float] = {}
+
+    def last_seen(self, key: str, now: float) -> float | None:
+        """Return when *key* was marked if that was less than *ttl* ago."""
+        self._expire(now)
+        return self._seen.get(key)
+
+    def mark(self, key: str, now: float) -> None:
+        self._seen.pop(key, None)
+        self._seen[key] = now
+
+    def _expire(self, now: float) -> None:
+        seen = self._seen
+        while seen:
+            key, stamp = next(iter(seen.items()))
+            if now - stamp < self._ttl:
+                break
+            del seen[key]
+
+
+# Cooldown and dedup state only matters for seconds, so it lives in memory
+# rather than as one agent-storage key per sender / objective (every storage
+# write rewrites the whole store, and those keys were never removed)
+_sender_cooldowns = _RecentKeys(_SENDER_COOLDOWN_SECS)
+_recent_objectives = _RecentKeys(_DEDUP_WINDOW_SECS)
+
+# Chat-originated tasks awaiting a connector result (task_id -> meta), one
+# map per agent storage.  Loaded from that storage on first use and kept as
+# a read cache; every change is written through, so a crash loses no
+# correlations.
+_chat_pending: weakref.WeakKeyDictionary[object, dict[str, dict]] = weakref.WeakKeyDictionary()
+
+
+def _pending_tasks(ctx: Context) -> dict[str, dict]:
+    pending = _chat_pending.get(ctx.storage)
+    if pending is None:
+        stored = ctx.storage.get("chat_pending")
+        if isinstance(stored, str):  # earlier releases stored a JSON string
+            try:
+                stored = json.loads(stored)
+            except json.JSONDecodeError:
+                stored = None
+        pending = _chat_pending[ctx.storage] = stored if isinstance(stored, dict) else {}
+    return pending
+
+
+def _record_chat_task(ctx: Context, task_id: str, meta: dict) -> None:
+    """Remember that *task_id* was dispatched from chat."""
+    _pending_tasks(ctx)[task_id] = meta
+    _save_chat_pending(ctx)
+
+
+def pop_chat_task(ctx: Context, task_id: str) -> dict | None:
+    """Remove and return the chat metadata for *task_id*, if it came from chat."""
+    meta = _pending_tasks(ctx).pop(task_id, None)
+    if meta is not None:
+        _save_chat_pending(ctx)
+    return meta
+
+
+def _save_chat_pending(ctx: Context) -> None:
+    """Persist the pending chat tasks to agent storage."""
+    ctx.storage.set("chat_pending", _pending_tasks(ctx))
+
+
 def _get_pending_count(ctx: Context) -> int:
     """Return the number of pending chat tasks."""
-    pending = ctx.storage.get("chat_pending")
-    if not pending:
-        return 0
-    try:
-        return len(json.loads(pending))
-    except (json.JSONDecodeError, TypeError):
-        return 0
+    return len(_pending_tasks(ctx))
 
 
 def _prune_pending(ctx: Context) -> None:
     """Remove all pending chat tasks to prevent unbounded growth."""
-    ctx.storage.set("chat_pending", "{}")
+    _pending_tasks(ctx).clear()
+    _save_chat_pending(ctx)
 
 
 # ---------------------------------------------------------------------------
@@ -275,12 +426,12 @@ async def handle_chat_message(ctx: Context, sender: str, msg: ChatMessage):
     """
     Receive a natural-language objective from ASI:One and process it.
     """
+    # Imported per call: orchestrator.agent imports this module
     from orchestrator.agent import (
         fetch_policy,
         orchestrator_private_key,
         pairing_store,
     )
-    from shared.crypto import sign_payload
 
     # --- Acknowledge immediately ---------------------------------------------
     await ctx.send(
@@ -334,27 +485,23 @@ async def handle_chat_message(ctx: Context, sender: str, msg: ChatMessage):
 
     # --- Per-sender cooldown -------------------------------------------------
     now = time.time()
-    sender_key = f"sender_cd:{hashlib.md5(sender.encode()).hexdigest()[:12]}"
-    last_dispatch = ctx.storage.get(sender_key)
-    if last_dispatch and (now - float(last_dispatch)) < _SENDER_COOLDOWN_SECS:
+    last_dispatch = _sender_cooldowns.last_seen(sender, now)
+    if last_dispatch is not None:
         ctx.logger.warning(
             "Sender %s in cooldown (%.0fs remaining) - ignoring",
             sender[:20],
-            _SENDER_COOLDOWN_SECS - (now - float(last_dispatch)),
+            _SENDER_COOLDOWN_SECS - (now - last_dispatch),
         )
         return
 
     # --- Dedup: ignore exact same text within short window -------------------
-    obj_hash = hashlib.md5(objective_text.encode()).hexdigest()[:12]
-    dedup_key = f"dedup:{obj_hash}"
-    last_seen = ctx.storage.get(dedup_key)
-    if last_seen and (now - float(last_seen)) < 120:
+    if _recent_objectives.last_seen(objective_text, now) is not None:
         ctx.logger.warning("Duplicate objective - ignoring: %.60s", objective_text)
         return
-    ctx.storage.set(dedup_key, str(now))
+    _recent_objectives.mark(objective_text, now)
 
     # --- Plan the objective --------------------------------------------------
-    plan = plan_objective(objective_text)
+    plan = await aplan_objective(objective_text)
     ctx.logger.info("Generated plan %s with %d steps", plan.task_id, len(plan.steps))
 
     # --- Fetch-side policy ---------------------------------------------------
@@ -368,7 +515,7 @@ async def handle_chat_message(ctx: Context, sender: str, msg: ChatMessage):
         return
 
     # --- Start sender cooldown (BEFORE dispatching) --------------------------
-    ctx.storage.set(sender_key, str(now))
+    _sender_cooldowns.mark(sender, now)
 
     # --- Try to dispatch to a paired connector -------------------------------
     devices = pairing_store.devices_for_user(user_id)
@@ -379,33 +526,26 @@ async def handle_chat_message(ctx: Context, sender: str, msg: ChatMessage):
 
     if devices:
         device = devices[0]
-        plan_dict = plan.model_dump(mode="json")
-        plan_json = json.dumps(plan_dict, sort_keys=True, default=str)
-
-        signature = ""
-        if orchestrator_private_key is not None:
-            signature = sign_payload(orchestrator_private_key, plan_dict)
-
-        dispatch = TaskDispatchRequest(
-            user_id=device.user_id,
-            device_id=device.device_id,
-            task_plan_json=plan_json,
-            signature=signature,
-        )
-
-        # Store pending task for async result correlation (chat-originated)
-        pending = ctx.storage.get("chat_pending") or "{}"
-        pending_dict: dict = json.loads(pending)
-        pending_dict[plan.task_id] = {
-            "sender": sender,
-            "objective": objective_text,
-        }
-        ctx.storage.set("chat_pending", json.dumps(pending_dict))
-
+        # Look the connector up first: without one the plan runs locally and
+        # serialising, signing and tracking it would be wasted work
         connector_address = ctx.storage.get(
             f"connector:{device.user_id}:{device.device_id}"
         )
         if connector_address:
+            plan_json, signature = sign_and_serialise(orchestrator_private_key, plan)
+
+            dispatch = TaskDispatchRequest(
+                user_id=device.user_id,
+                device_id=device.device_id,
+                task_plan_json=plan_json,
+                signature=signature,
+            )
+
+            # Store pending task for async result correlation (chat-originated)
+            _record_chat_task(
+                ctx, plan.task_id, {"sender": sender, "objective": objective_text}
+            )
+
             ctx.logger.info(
                 "Dispatching task %s to connector %s", plan.task_id, connector_address
             )
@@ -427,13 +567,10 @@ async def handle_chat_message(ctx: Context, sender: str, msg: ChatMessage):
     ctx.logger.info("No connector available - executing plan locally")
     from connector.executor import execute_plan
 
-    result = execute_plan(plan)
+    result = await asyncio.to_thread(execute_plan, plan)
 
     # Format results as readable text
-    report_text = (
-        result.outputs.get("generate_report", {}).get("report_text")
-        or result.outputs.get("generate_health_report", {}).get("report_text")
-    )
+    report_text = report_text_from_outputs(result.outputs)
 
     if report_text:
         await send_chat_reply(ctx, sender, report_text)
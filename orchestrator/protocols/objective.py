@@ -8,24 +8,37 @@ returns results.
 
 from __future__ import annotations
 
-import json
 import logging
 
 from uagents import Context, Protocol
 
-from orchestrator.planner import plan_objective
+from orchestrator.planner import aplan_objective
+from orchestrator.protocols.chat import (
+    pop_chat_task,
+    report_text_from_outputs,
+    send_chat_reply,
+)
 from orchestrator.protocols.models import (
     ObjectiveRequest,
     ObjectiveResponse,
     TaskDispatchRequest,
     TaskExecutionResult,
 )
+from shared.crypto import sign_and_serialise
 from shared.schemas import RejectionReason
 
 logger = logging.getLogger(__name__)
 
 objective_protocol = Protocol(name="objective-intake", version="0.1.0")
 
+# Enum .value goes through a descriptor on every access; bind it once
+_DEVICE_NOT_PAIRED = RejectionReason.DEVICE_NOT_PAIRED.value
+
+
+def _pending_key(task_id: str) -> str:
+    """Storage key correlating a dispatched task with its requester."""
+    return f"pending_task:{task_id}"
+
 
 @objective_protocol.on_message(ObjectiveRequest, replies={ObjectiveResponse})
 async def handle_objective(ctx: Context, sender: str, msg: ObjectiveRequest):
@@ -36,8 +49,8 @@ async def handle_objective(ctx: Context, sender: str, msg: ObjectiveRequest):
     4. Dispatch to connector
     5. Return result to ASI:One
     """
+    # Imported per call: orchestrator.agent imports this module
     from orchestrator.agent import pairing_store, fetch_policy, orchestrator_private_key
-    from shared.crypto import sign_payload
 
     ctx.logger.info(
         "Received objective from user %s: %.80s", msg.user_id, msg.objective
@@ -53,7 +66,7 @@ async def handle_objective(ctx: Context, sender: str, msg: ObjectiveRequest):
                 user_id=msg.user_id,
                 task_id="",
                 status="rejected",
-                reason=RejectionReason.DEVICE_NOT_PAIRED.value,
+                reason=_DEVICE_NOT_PAIRED,
                 message="No paired device found. Please pair a device first.",
             ),
         )
@@ -63,30 +76,26 @@ async def handle_objective(ctx: Context, sender: str, msg: ObjectiveRequest):
     device = devices[0]
 
     # --- 2. Plan -------------------------------------------------------------
-    plan = plan_objective(msg.objective)
+    plan = await aplan_objective(msg.objective)
 
     # --- 3. Policy -----------------------------------------------------------
     rejection = fetch_policy.validate(msg.user_id, plan)
     if rejection is not None:
+        reason = rejection.value
         await ctx.send(
             sender,
             ObjectiveResponse(
                 user_id=msg.user_id,
                 task_id=plan.task_id,
                 status="rejected",
-                reason=rejection.value,
-                message=f"Policy check failed: {rejection.value}",
+                reason=reason,
+                message=f"Policy check failed: {reason}",
             ),
         )
         return
 
     # --- 4. Dispatch to connector -------------------------------------------
-    plan_dict = plan.model_dump(mode="json")
-    plan_json = json.dumps(plan_dict, sort_keys=True, default=str)
-
-    signature = ""
-    if orchestrator_private_key is not None:
-        signature = sign_payload(orchestrator_private_key, plan_dict)
+    plan_json, signature = sign_and_serialise(orchestrator_private_key, plan)
 
     dispatch = TaskDispatchRequest(
         user_id=msg.user_id,
@@ -95,18 +104,15 @@ async def handle_objective(ctx: Context, sender: str, msg: ObjectiveRequest):
         signature=signature,
     )
 
-    # Store pending task so we can correlate the reply
-    pending = ctx.storage.get("pending_tasks") or "{}"
-    pending_dict: dict = json.loads(pending)
-    pending_dict[plan.task_id] = {
-        "sender": sender,
-        "user_id": msg.user_id,
-    }
-    ctx.storage.set("pending_tasks", json.dumps(pending_dict))
-
     # Look up the connector agent address in storage
     connector_address = ctx.storage.get(f"connector:{msg.user_id}:{device.device_id}")
     if connector_address:
+        # Store pending task so we can correlate the reply (one small key
+        # per task, so nothing else is read or rewritten)
+        ctx.storage.set(
+            _pending_key(plan.task_id),
+            {"sender": sender, "user_id": msg.user_id},
+        )
         ctx.logger.info(
             "Dispatching task %s to connector %s", plan.task_id, connector_address
         )
@@ -155,19 +161,16 @@ async def handle_execution_result(ctx: Context, sender: str, msg: TaskExecutionR
     )
 
     # --- Check if this was a chat-originated task ----------------------------
-    chat_pending = ctx.storage.get("chat_pending") or "{}"
-    chat_dict: dict = json.loads(chat_pending)
-    chat_meta = chat_dict.pop(msg.task_id, None)
+    chat_meta = pop_chat_task(ctx, msg.task_id)
     if chat_meta is not None:
-        ctx.storage.set("chat_pending", json.dumps(chat_dict))
         await _relay_to_chat(ctx, chat_meta, msg)
         return
 
     # --- Otherwise it's a standard ObjectiveRequest flow ---------------------
-    pending = ctx.storage.get("pending_tasks") or "{}"
-    pending_dict: dict = json.loads(pending)
-    task_meta = pending_dict.pop(msg.task_id, None)
-    ctx.storage.set("pending_tasks", json.dumps(pending_dict))
+    pending_key = _pending_key(msg.task_id)
+    task_meta = ctx.storage.get(pending_key)
+    if task_meta is not None:
+        ctx.storage.remove(pending_key)
 
     if task_meta is None:
         ctx.logger.warning("No pending request for task %s – ignoring", msg.task_id)
@@ -188,8 +191,6 @@ async def handle_execution_result(ctx: Context, sender: str, msg: TaskExecutionR
 
 async def _relay_to_chat(ctx: Context, chat_meta: dict, msg: TaskExecutionResult):
     """Format a TaskExecutionResult and send it back as a ChatMessage."""
-    from orchestrator.protocols.chat import send_chat_reply
-
     lines: list[str] = []
 
     if msg.status == "rejected":
@@ -200,12 +201,7 @@ async def _relay_to_chat(ctx: Context, chat_meta: dict, msg: TaskExecutionResult
         return
 
     # --- Check if outputs contain a report (weekly or health) ----------------
-    report_text = None
-    if msg.outputs:
-        report_text = (
-            msg.outputs.get("generate_report", {}).get("report_text")
-            or msg.outputs.get("generate_health_report", {}).get("report_text")
-        )
+    report_text = report_text_from_outputs(msg.outputs)
 
     if report_text:
         # The report IS the primary output - send it directly
@@ -8,19 +8,20 @@ an external datastore.  For the MVP we keep everything in-process.
 from __future__ import annotations
 
 import logging
-from datetime import datetime, timezone
 
 from shared.schemas import DeviceRecord
 
 logger = logging.getLogger(__name__)
 
+_NO_DEVICES: dict[str, DeviceRecord] = {}
+
 
 class PairingStore:
     """Thread-safe in-memory registry of paired devices."""
 
     def __init__(self) -> None:
-        # key = (user_id, device_id)
-        self._devices: dict[tuple[str, str], DeviceRecord] = {}
+        # user_id -> {device_id: record}; every lookup is plain str hashing
+        self._by_user: dict[str, dict[str, DeviceRecord]] = {}
 
     # ------------------------------------------------------------------
     # Write
@@ -38,16 +39,17 @@ class PairingStore:
             device_id=device_id,
             public_key_hex=public_key_hex,
             capabilities=capabilities or ["weekly_report"],
-            paired_at=datetime.now(timezone.utc),
         )
-        self._devices[(user_id, device_id)] = record
+        self._by_user.setdefault(user_id, {})[device_id] = record
         logger.info("Paired device %s for user %s", device_id, user_id)
         return record
 
     def unpair(self, user_id: str, device_id: str) -> bool:
-        key = (user_id, device_id)
-        if key in self._devices:
-            del self._devices[key]
+        user_devices = self._by_user.get(user_id)
+        if user_devices is not None and device_id in user_devices:
+            del user_devices[device_id]
+            if not user_devices:
+                del self._by_user[user_id]
             logger.info("Unpaired device %s for user %s", device_id, user_id)
             return True
         return False
@@ -57,15 +59,18 @@ class PairingStore:
     # ------------------------------------------------------------------
 
     def get(self, user_id: str, device_id: str) -> DeviceRecord | None:
-        return self._devices.get((user_id, device_id))
+        return self._by_user.get(user_id, _NO_DEVICES).get(device_id)
 
     def is_paired(self, user_id: str, device_id: str) -> bool:
-        return (user_id, device_id) in self._devices
+        return device_id in self._by_user.get(user_id, _NO_DEVICES)
 
     def devices_for_user(self, user_id: str) -> list[DeviceRecord]:
-        return [
-            rec for (uid, _), rec in self._devices.items() if uid == user_id
-        ]
+        user_devices = self._by_user.get(user_id)
+        return list(user_devices.values()) if user_devices else []
 
     def all_devices(self) -> list[DeviceRecord]:
-        return list(self._devices.values())
+        """All records, grouped by user."""
+        return [
+            rec for user_devices in self._by_user.values()
+            for rec in user_devices.values()
+        ]
@@ -14,6 +14,7 @@ Run:
 
 from __future__ import annotations
 
+import asyncio
 import json
 import os
 import sys
@@ -26,9 +27,16 @@ sys.path.insert(0, str(PROJECT_ROOT))
 # Force demo directory for safe testing
 os.environ.setdefault("DEMO_PROJECTS_DIR", str(PROJECT_ROOT / "demo_projects"))
 
-from shared.crypto import generate_keypair, public_key_to_hex, sign_payload, verify_signature
+from shared.crypto import (
+    generate_keypair,
+    load_keypair,
+    public_key_to_hex,
+    save_keypair,
+    sign_and_serialise,
+    verify_signature,
+)
 from shared.schemas import TaskPlan, TaskStatus
-from orchestrator.planner import plan_objective
+from orchestrator.planner import aplan_objective
 from orchestrator.policy import FetchPolicy
 from orchestrator.storage import PairingStore
 from connector.auth import RequestAuthenticator
@@ -36,6 +44,18 @@ from connector.policy import LocalPolicy
 from connector.executor import execute_plan
 
 
+TEST_KEY_DIR = PROJECT_ROOT / "demo_projects" / ".testkey"
+
+
+def _load_or_gen_keypair(directory: Path):
+    """Reuse the keypair cached in *directory*, creating it on first run."""
+    if (directory / "private.hex").exists():
+        return load_keypair(directory), True
+    priv, pub = generate_keypair()
+    save_keypair(directory, priv)
+    return (priv, pub), False
+
+
 def divider(title: str):
     print(f"\n{'=' * 60}")
     print(f"  {title}")
@@ -48,9 +68,9 @@ def main():
     # ------------------------------------------------------------------
     divider("1. DEVICE PAIRING")
 
-    priv, pub = generate_keypair()
+    (priv, pub), cached = _load_or_gen_keypair(TEST_KEY_DIR)
     pub_hex = public_key_to_hex(pub)
-    print(f"  Generated device keypair")
+    print(f"  {'Loaded cached' if cached else 'Generated'} device keypair")
     print(f"  Public key : {pub_hex[:32]}…")
 
     store = PairingStore()
@@ -67,7 +87,7 @@ def main():
     objective = "Generate my weekly dev report and post a summary to Slack"
     print(f"  Objective: {objective}")
 
-    plan = plan_objective(objective)
+    plan = asyncio.run(aplan_objective(objective))
     print(f"  Task ID  : {plan.task_id}")
     print(f"  Steps    : {len(plan.steps)}")
     for i, step in enumerate(plan.steps, 1):
@@ -93,13 +113,12 @@ def main():
     # ------------------------------------------------------------------
     divider("4. SIGN TASK PLAN")
 
-    plan_dict = plan.model_dump(mode="json")
-    plan_json = json.dumps(plan_dict, sort_keys=True, default=str)
-    signature = sign_payload(priv, plan_dict)
+    # Same helper the orchestrator dispatches with
+    plan_json, signature = sign_and_serialise(priv, plan)
     print(f"  Signature: {signature[:32]}…")
 
     # Verify
-    ok = verify_signature(pub_hex, plan_dict, signature)
+    ok = verify_signature(pub_hex, json.loads(plan_json), signature)
     print(f"  ✅ Signature valid: {ok}")
 
     # ------------------------------------------------------------------
@@ -108,7 +127,7 @@ def main():
     divider("5. CONNECTOR AUTHENTICATION")
 
     auth = RequestAuthenticator(orchestrator_public_key_hex=pub_hex)
-    ok, reason = auth.verify_dispatch(plan_json, signature)
+    ok, reason, _ = auth.verify_dispatch(plan_json, signature)
     print(f"  Auth result: ok={ok}, reason={reason}")
     assert ok
     print(f"  ✅ Connector accepted the signed dispatch")
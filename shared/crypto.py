@@ -10,6 +10,8 @@ Uses Ed25519 for:
 from __future__ import annotations
 
 import json
+import os
+from functools import lru_cache
 from pathlib import Path
 
 from cryptography.hazmat.primitives.asymmetric.ed25519 import (
@@ -17,6 +19,9 @@ from cryptography.hazmat.primitives.asymmetric.ed25519 import (
     Ed25519PublicKey,
 )
 from cryptography.hazmat.primitives import serialization
+from pydantic import BaseModel
+
+from shared import fastjson
 
 
 # ---------------------------------------------------------------------------
@@ -51,34 +56,83 @@ def private_key_from_hex(hex_str: str) -> Ed25519PrivateKey:
     return Ed25519PrivateKey.from_private_bytes(bytes.fromhex(hex_str))
 
 
+@lru_cache(maxsize=128)
 def public_key_from_hex(hex_str: str) -> Ed25519PublicKey:
-    from cryptography.hazmat.primitives.asymmetric.ed25519 import (
-        Ed25519PublicKey as _Pub,
-    )
-    return _Pub.from_public_bytes(bytes.fromhex(hex_str))
+    """Parse a hex public key; repeat lookups of the same key are cached."""
+    return Ed25519PublicKey.from_public_bytes(bytes.fromhex(hex_str))
 
 
 # ---------------------------------------------------------------------------
 # Signing / verification
 # ---------------------------------------------------------------------------
 
+def canonical_json(payload: dict) -> bytes:
+    """Return the canonical byte form of *payload* that is signed/verified."""
+    return json.dumps(payload, sort_keys=True, default=str).encode()
+
+
 def sign_payload(private_key: Ed25519PrivateKey, payload: dict) -> str:
     """Sign a JSON-serialisable dict; return hex-encoded signature."""
-    canonical = json.dumps(payload, sort_keys=True, default=str).encode()
-    sig = private_key.sign(canonical)
+    sig = private_key.sign(canonical_json(payload))
     return sig.hex()
 
 
+def sign_and_serialise(
+    private_key: Ed25519PrivateKey | None,
+    payload: dict | BaseModel,
+) -> tuple[str, str]:
+    """
+    Return ``(payload_json, signature_hex)`` ready to put on the wire.
+
+    When signing, the JSON returned is the canonical form that was signed,
+    so the payload is serialised only once.  Without a key the signature
+    is ``""`` and the payload is dumped with the fast encoder; a model is
+    then serialised directly, without building an intermediate dict.
+    """
+    if private_key is None:
+        if isinstance(payload, BaseModel):
+            return payload.model_dump_json(), ""
+        return fastjson.dumps(payload), ""
+    if isinstance(payload, BaseModel):
+        payload = payload.model_dump(mode="json")
+    canonical = canonical_json(payload)
+    return canonical.decode(), private_key.sign(canonical).hex()
+
+
 def verify_signature(
     public_key_hex: str,
     payload: dict,
     signature_hex: str,
 ) -> bool:
     """Verify an Ed25519 signature over a canonical JSON payload."""
+    try:
+        canonical = canonical_json(payload)
+    except Exception:
+        return False
+    return verify_signature_bytes(public_key_hex, canonical, signature_hex)
+
+
+def verify_signature_bytes(
+    public_key_hex: str,
+    canonical: bytes,
+    signature_hex: str,
+) -> bool:
+    """Verify an Ed25519 signature over already-canonicalised bytes."""
     try:
         pub = public_key_from_hex(public_key_hex)
-        canonical = json.dumps(payload, sort_keys=True, default=str).encode()
-        pub.verify(bytes.fromhex(signature_hex), canonical)
+    except Exception:
+        return False
+    return verify_with_key(pub, canonical, signature_hex)
+
+
+def verify_with_key(
+    public_key: Ed25519PublicKey,
+    canonical: bytes,
+    signature_hex: str,
+) -> bool:
+    """Like :func:`verify_signature_bytes` but with a pre-parsed public key."""
+    try:
+        public_key.verify(bytes.fromhex(signature_hex), canonical)
         return True
     except Exception:
         return False
@@ -96,7 +150,12 @@ def save_keypair(directory: str | Path, private_key: Ed25519PrivateKey) -> Path:
     priv_hex = private_key_to_hex(private_key)
     pub_hex = public_key_to_hex(private_key.public_key())
 
-    (directory / "private.hex").write_text(priv_hex)
+    # Created owner-only, so the key is never readable by others, even briefly
+    fd = os.open(directory / "private.hex", os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w") as fh:
+        if hasattr(os, "fchmod"):  # an existing file keeps its old mode otherwise
+            os.fchmod(fd, 0o600)
+        fh.write(priv_hex)
     (directory / "public.hex").write_text(pub_hex)
     return directory
 
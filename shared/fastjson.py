@@ -0,0 +1,38 @@
+"""
+JSON helpers that use ``orjson`` when it is installed.
+
+``orjson`` is an optional accelerator (``pip install openclaw-fetch[fast]``);
+without it everything falls back to the stdlib ``json`` module.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def loads(data: str | bytes) -> Any:
+    """Parse a JSON document.  Raises :class:`json.JSONDecodeError` on bad input."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any) -> str:
+    """Serialise *obj* (Pydantic models included) to a compact JSON string."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default).decode()
+    return json.dumps(obj, default=_default, separators=(",", ":"), ensure_ascii=False)
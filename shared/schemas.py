@@ -7,7 +7,7 @@ and the OpenClaw Connector so the wire format is defined in one place.
 
 from __future__ import annotations
 
-import uuid
+import secrets
 from datetime import datetime, timezone
 from enum import Enum
 from typing import Any
@@ -15,6 +15,11 @@ from typing import Any
 from pydantic import BaseModel, Field
 
 
+def _utcnow() -> datetime:
+    """Timestamp default shared by every model."""
+    return datetime.now(timezone.utc)
+
+
 # ---------------------------------------------------------------------------
 # Enums
 # ---------------------------------------------------------------------------
@@ -75,10 +80,10 @@ class TaskConstraints(BaseModel):
 
 class TaskPlan(BaseModel):
     """Immutable task plan produced by the orchestrator's planner."""
-    task_id: str = Field(default_factory=lambda: f"task_{uuid.uuid4().hex[:12]}")
+    task_id: str = Field(default_factory=lambda: f"task_{secrets.token_hex(6)}")
     steps: list[TaskStep]
     constraints: TaskConstraints = Field(default_factory=TaskConstraints)
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    created_at: datetime = Field(default_factory=_utcnow)
 
 
 # ---------------------------------------------------------------------------
@@ -112,7 +117,7 @@ class ExecutionResult(BaseModel):
     step_results: list[StepResult] = Field(default_factory=list)
     outputs: dict[str, Any] = Field(default_factory=dict)
     reason: RejectionReason | None = None
-    completed_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    completed_at: datetime = Field(default_factory=_utcnow)
 
 
 # ---------------------------------------------------------------------------
@@ -141,4 +146,4 @@ class DeviceRecord(BaseModel):
     device_id: str
     public_key_hex: str
     capabilities: list[str]
-    paired_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    paired_at: datetime = Field(default_factory=_utcnow)
@@ -1,9 +1,7 @@
 """Tests for connector.auth – request signature verification."""
 
-import json
-
 from connector.auth import RequestAuthenticator
-from shared.crypto import generate_keypair, public_key_to_hex, sign_payload
+from shared.crypto import generate_keypair, public_key_to_hex, sign_and_serialise
 from shared.schemas import RejectionReason, TaskPlan, TaskStep, StepType
 
 
@@ -13,23 +11,21 @@ def _make_signed_plan():
     plan = TaskPlan(
         steps=[TaskStep(type=StepType.LOCAL, action="scan_directory")]
     )
-    plan_dict = plan.model_dump(mode="json")
-    plan_json = json.dumps(plan_dict, sort_keys=True, default=str)
-    sig = sign_payload(priv, plan_dict)
+    plan_json, sig = sign_and_serialise(priv, plan)
     return plan_json, sig, public_key_to_hex(pub)
 
 
 def test_verify_valid_signature():
     plan_json, sig, pub_hex = _make_signed_plan()
     auth = RequestAuthenticator(orchestrator_public_key_hex=pub_hex)
-    ok, reason = auth.verify_dispatch(plan_json, sig)
+    ok, reason, _ = auth.verify_dispatch(plan_json, sig)
     assert ok is True
     assert reason is None
 
 
 def test_reject_empty_signature():
     auth = RequestAuthenticator(orchestrator_public_key_hex="a" * 64)
-    ok, reason = auth.verify_dispatch("{}", "")
+    ok, reason, _ = auth.verify_dispatch("{}", "")
     assert ok is False
     assert reason == RejectionReason.INVALID_SIGNATURE
 
@@ -38,7 +34,7 @@ def test_reject_tampered_payload():
     plan_json, sig, pub_hex = _make_signed_plan()
     auth = RequestAuthenticator(orchestrator_public_key_hex=pub_hex)
     tampered = plan_json.replace("scan_directory", "delete_all")
-    ok, reason = auth.verify_dispatch(tampered, sig)
+    ok, reason, _ = auth.verify_dispatch(tampered, sig)
     assert ok is False
     assert reason == RejectionReason.INVALID_SIGNATURE
 
@@ -46,7 +42,7 @@ def test_reject_tampered_payload():
 def test_no_key_allows_in_dev_mode():
     """With no orchestrator key configured, verification is skipped."""
     auth = RequestAuthenticator()
-    ok, reason = auth.verify_dispatch("{}", "any-sig")
+    ok, reason, _ = auth.verify_dispatch("{}", "any-sig")
     assert ok is True
     assert reason is None
 
@@ -57,5 +53,49 @@ def test_reject_wrong_key():
     auth = RequestAuthenticator(
         orchestrator_public_key_hex=public_key_to_hex(other_pub)
     )
-    ok, reason = auth.verify_dispatch(plan_json, sig)
+    ok, reason, _ = auth.verify_dispatch(plan_json, sig)
     assert ok is False
+
+
+def test_verify_accepts_non_canonical_json():
+    import json
+
+    plan_json, sig, pub_hex = _make_signed_plan()
+    auth = RequestAuthenticator(orchestrator_public_key_hex=pub_hex)
+    reordered = json.dumps(dict(reversed(list(json.loads(plan_json).items()))))
+    assert reordered != plan_json
+    ok, reason, _ = auth.verify_dispatch(reordered, sig)
+    assert ok is True
+    assert reason is None
+
+
+def test_verify_returns_parsed_plan():
+    plan_json, sig, pub_hex = _make_signed_plan()
+    auth = RequestAuthenticator(orchestrator_public_key_hex=pub_hex)
+    ok, _, plan_dict = auth.verify_dispatch(plan_json, sig)
+    assert ok is True
+    assert TaskPlan.model_validate(plan_dict).steps[0].action == "scan_directory"
+
+    # An already-parsed dict is accepted as-is
+    ok, _, same = auth.verify_dispatch(plan_dict, sig)
+    assert ok is True
+    assert same is plan_dict
+
+
+def test_malformed_key_rejects():
+    plan_json, sig, _ = _make_signed_plan()
+    auth = RequestAuthenticator(orchestrator_public_key_hex="zz")
+    ok, reason, _ = auth.verify_dispatch(plan_json, sig)
+    assert ok is False
+    assert reason == RejectionReason.INVALID_SIGNATURE
+
+
+def test_non_utf8_payload_rejected_without_orjson(monkeypatch):
+    from shared import fastjson
+
+    monkeypatch.setattr(fastjson, "orjson", None)
+    _, sig, pub_hex = _make_signed_plan()
+    auth = RequestAuthenticator(orchestrator_public_key_hex=pub_hex)
+    assert auth.verify_dispatch(b"\xff", sig) == (
+        False, RejectionReason.INVALID_SIGNATURE, None
+    )
@@ -0,0 +1,116 @@
+"""Tests for orchestrator.protocols.chat – echo / feedback-loop detection."""
+
+import json
+
+import pytest
+
+from orchestrator.protocols import chat
+from orchestrator.protocols.chat import _looks_like_echo
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "Generate my weekly dev report and post a summary",
+        "@agent1" + "q" * 59 + " analyze https://github.com/owner/repo",
+        "Please check the repo health",
+    ],
+)
+def test_genuine_requests_pass(text):
+    assert not _looks_like_echo(text)
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "Report complete! Standing by for results",
+        "Great, MISSION ACCOMPLISHED for the report",
+        "Your report for task_0123456789ab is ready",
+        "🚀 🎉 ✅ report",
+        "Sounds good to me",
+    ],
+)
+def test_echoes_are_detected(text):
+    assert _looks_like_echo(text)
+
+
+def test_echo_pattern_fallback_matches_automaton(monkeypatch):
+    texts = [p.upper() for p in chat._ECHO_PATTERNS] + [
+        "nothing to see here",
+        "a weekly report",
+    ]
+    expected = [chat._has_echo_pattern(t.lower()) for t in texts]
+    monkeypatch.setattr(chat, "_ECHO_AUTOMATON", None)
+    assert [chat._has_echo_pattern(t.lower()) for t in texts] == expected
+    assert expected[: len(chat._ECHO_PATTERNS)] == [True] * len(chat._ECHO_PATTERNS)
+
+
+class _FakeStorage:
+    def __init__(self, data=None):
+        self.data = dict(data or {})
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value):
+        # Like uagents' JSON-file store: later changes to *value* are not seen
+        self.data[key] = json.loads(json.dumps(value))
+
+
+class _FakeCtx:
+    def __init__(self, data=None):
+        self.storage = _FakeStorage(data)
+
+
+class TestRecentKeys:
+    def test_key_expires_after_ttl(self):
+        recent = chat._RecentKeys(ttl=30)
+        recent.mark("alice", now=100.0)
+        assert recent.last_seen("alice", now=129.0) == 100.0
+        assert recent.last_seen("alice", now=130.0) is None
+
+    def test_remark_refreshes_and_old_keys_are_dropped(self):
+        recent = chat._RecentKeys(ttl=30)
+        recent.mark("alice", now=100.0)
+        recent.mark("bob", now=110.0)
+        recent.mark("alice", now=120.0)
+        assert recent.last_seen("bob", now=145.0) is None
+        assert recent.last_seen("alice", now=145.0) == 120.0
+        assert list(recent._seen) == ["alice"]
+
+
+class TestChatPending:
+    def test_loads_legacy_json_string_and_saves_dict(self):
+        ctx = _FakeCtx({"chat_pending": '{"task_a": {"sender": "s"}}'})
+
+        assert chat.pop_chat_task(ctx, "task_a") == {"sender": "s"}
+        assert chat.pop_chat_task(ctx, "task_a") is None
+        assert ctx.storage.data["chat_pending"] == {}
+
+    def test_changes_are_written_through(self):
+        ctx = _FakeCtx()
+
+        chat._record_chat_task(ctx, "task_b", {"sender": "t"})
+        assert ctx.storage.data["chat_pending"] == {"task_b": {"sender": "t"}}
+
+        # A restarted agent (new storage over the same data) still routes the result
+        restarted = _FakeCtx(ctx.storage.data)
+        assert chat.pop_chat_task(restarted, "task_b") == {"sender": "t"}
+        assert restarted.storage.data["chat_pending"] == {}
+
+    def test_each_storage_has_its_own_tasks(self):
+        first, second = _FakeCtx(), _FakeCtx()
+
+        chat._record_chat_task(first, "task_c", {"sender": "u"})
+        assert chat._get_pending_count(second) == 0
+        assert chat.pop_chat_task(second, "task_c") is None
+        assert chat.pop_chat_task(first, "task_c") == {"sender": "u"}
+
+
+def test_report_text_from_outputs():
+    assert chat.report_text_from_outputs({}) is None
+    assert chat.report_text_from_outputs(None) is None
+    assert chat.report_text_from_outputs({"generate_report": None}) is None
+    assert chat.report_text_from_outputs(
+        {"generate_report": {}, "generate_health_report": {"report_text": "ok"}}
+    ) == "ok"
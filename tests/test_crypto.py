@@ -1,16 +1,24 @@
 """Tests for shared.crypto – keypair generation, signing, verification."""
 
+import os
+import stat
 import tempfile
 from pathlib import Path
 
+import pytest
+
 from shared.crypto import (
+    canonical_json,
     generate_keypair,
     load_keypair,
     private_key_to_hex,
+    public_key_from_hex,
     public_key_to_hex,
     save_keypair,
+    sign_and_serialise,
     sign_payload,
     verify_signature,
+    verify_signature_bytes,
 )
 
 
@@ -68,3 +76,57 @@ def test_save_and_load_keypair():
 
     assert private_key_to_hex(loaded_priv) == private_key_to_hex(priv)
     assert public_key_to_hex(loaded_pub) == public_key_to_hex(pub)
+
+
+@pytest.mark.skipif(os.name != "posix", reason="POSIX file modes")
+def test_private_key_file_is_owner_only(tmp_path):
+    (tmp_path / "private.hex").write_text("old")
+    (tmp_path / "private.hex").chmod(0o644)
+    save_keypair(tmp_path, generate_keypair()[0])
+    assert stat.S_IMODE((tmp_path / "private.hex").stat().st_mode) == 0o600
+
+
+def test_verify_signature_bytes():
+    priv, pub = generate_keypair()
+    payload = {"b": 2, "a": 1}
+    sig = sign_payload(priv, payload)
+    assert verify_signature_bytes(public_key_to_hex(pub), canonical_json(payload), sig) is True
+    assert verify_signature_bytes(public_key_to_hex(pub), b"{}", sig) is False
+
+
+def test_sign_and_serialise_ships_the_signed_bytes():
+    import json
+
+    priv, pub = generate_keypair()
+    payload = {"task_id": "t1", "steps": [{"action": "scan_directory"}]}
+
+    payload_json, sig = sign_and_serialise(priv, payload)
+    assert payload_json.encode() == canonical_json(payload)
+    assert verify_signature(public_key_to_hex(pub), json.loads(payload_json), sig)
+
+    payload_json, sig = sign_and_serialise(None, payload)
+    assert sig == ""
+    assert json.loads(payload_json) == payload
+
+
+def test_sign_and_serialise_accepts_a_model():
+    import json
+
+    from shared.schemas import TaskPlan
+
+    priv, pub = generate_keypair()
+    plan = TaskPlan(task_id="t1", steps=[])
+
+    payload_json, sig = sign_and_serialise(priv, plan)
+    assert payload_json.encode() == canonical_json(plan.model_dump(mode="json"))
+    assert verify_signature(public_key_to_hex(pub), json.loads(payload_json), sig)
+
+    payload_json, sig = sign_and_serialise(None, plan)
+    assert sig == ""
+    assert json.loads(payload_json) == plan.model_dump(mode="json")
+
+
+def test_public_key_from_hex_reuses_parsed_key():
+    _, pub = generate_keypair()
+    pub_hex = public_key_to_hex(pub)
+    assert public_key_from_hex(pub_hex) is public_key_from_hex(pub_hex)
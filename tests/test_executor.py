@@ -2,10 +2,23 @@
 
 import tempfile
 
+import pytest
+
 from shared.schemas import StepType, TaskPlan, TaskStatus, TaskStep
 from connector.executor import execute_plan
 
 
+@pytest.fixture
+def register_action(monkeypatch):
+    """``register_action`` whose registrations are undone after the test."""
+    from connector import executor
+
+    monkeypatch.setattr(executor, "_ACTIONS", dict(executor._ACTIONS))
+    monkeypatch.setattr(executor, "_DISPATCH", dict(executor._DISPATCH))
+    monkeypatch.setattr(executor, "_INDEPENDENT_ACTIONS", set(executor._INDEPENDENT_ACTIONS))
+    return executor.register_action
+
+
 def test_execute_summarise_text():
     plan = TaskPlan(
         steps=[
@@ -91,3 +104,57 @@ def test_pipeline_chaining():
         assert result.status == TaskStatus.COMPLETED
         report_out = result.step_results[1].output
         assert "report_text" in report_out
+
+
+def test_scan_directory_reports_repos_in_name_order(tmp_path):
+    import subprocess
+
+    from connector.workflows.weekly_report import scan_directory
+
+    for name in ("b-repo", "a-repo", "c-repo"):
+        repo = tmp_path / name
+        repo.mkdir()
+        subprocess.run(["git", "init", "-q", str(repo)], check=True)
+        subprocess.run(
+            ["git", "-C", str(repo), "-c", "user.name=T", "-c", "user.email=t@t",
+             "commit", "-q", "--allow-empty", "-m", f"work in {name}"],
+            check=True,
+        )
+    (tmp_path / "not-a-repo").mkdir()
+
+    repos = scan_directory({"path": str(tmp_path)})["repos"]
+    assert [r["repo"] for r in repos] == ["a-repo", "b-repo", "c-repo"]
+    assert repos[0]["commits"][0].endswith("work in a-repo")
+
+
+def test_registered_two_arg_action_receives_previous_output(register_action):
+    register_action("_echo_previous", lambda params, prev: {"prev": prev})
+    plan = TaskPlan(
+        steps=[
+            TaskStep(type=StepType.LOCAL, action="summarise_text", params={"text": "hi"}),
+            TaskStep(type=StepType.LOCAL, action="_echo_previous"),
+        ]
+    )
+    result = execute_plan(plan)
+    assert result.step_results[1].output == {"prev": {"summary": "hi"}}
+
+
+def test_independent_steps_run_concurrently_in_order(register_action):
+    import threading
+
+    barrier = threading.Barrier(2, timeout=5)
+
+    def _wait(params):
+        barrier.wait()  # deadlocks (then times out) if run sequentially
+        return {"n": params["n"]}
+
+    register_action("_parallel_wait", _wait, independent=True)
+    plan = TaskPlan(
+        steps=[
+            TaskStep(type=StepType.LOCAL, action="_parallel_wait", params={"n": 1}),
+            TaskStep(type=StepType.LOCAL, action="_parallel_wait", params={"n": 2}),
+        ]
+    )
+    result = execute_plan(plan)
+    assert result.status == TaskStatus.COMPLETED
+    assert [sr.output["n"] for sr in result.step_results] == [1, 2]
@@ -0,0 +1,16 @@
+"""Tests for shared.fastjson – optional orjson-backed JSON helpers."""
+
+import json
+
+from shared import fastjson
+from shared.schemas import StepResult, TaskStatus
+
+
+def test_dumps_pydantic_models():
+    results = [StepResult(action="scan_directory", status=TaskStatus.COMPLETED, output={"n": 1})]
+    decoded = json.loads(fastjson.dumps(results))
+    assert decoded == [results[0].model_dump(mode="json")]
+
+
+def test_loads_roundtrip():
+    assert fastjson.loads(fastjson.dumps({"a": [1, "é"]})) == {"a": [1, "é"]}
@@ -2,6 +2,8 @@
 
 import os
 
+import pytest
+
 # Ensure LLM is NOT used during unit tests (keyword fallback only)
 os.environ.pop("ASI_ONE_API_KEY", None)
 
@@ -45,3 +47,167 @@ def test_plan_has_constraints():
 def test_plan_task_id_generated():
     plan = plan_objective("test")
     assert plan.task_id.startswith("task_")
+
+
+async def test_async_planner_falls_back_to_keywords():
+    from orchestrator.planner import aplan_objective
+
+    plan = await aplan_objective("Scan my projects directory and generate a report")
+    actions = [s.action for s in plan.steps]
+    assert actions == ["scan_directory", "generate_report"]
+
+
+_SCAN_REPLY = '{"steps": [{"type": "local", "action": "scan_directory", "params": {}}]}'
+
+
+def _chunk(text):
+    from types import SimpleNamespace
+
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+
+
+class _FakeBadRequest(Exception):
+    def __init__(self, message, param=None):
+        super().__init__(message)
+        self.param = param
+
+
+class _LLMCalls(list):
+    """kwargs of each completion call, plus what the planner read back."""
+
+    def __init__(self):
+        super().__init__()
+        self.streamed = []
+        self.closed = 0
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    """
+    Install a fake streaming ASI:One client.
+
+    ``fake_llm(replies)`` makes every call stream the *replies* pieces and
+    returns the list of calls.  ``fail_json_mode`` rejects requests that
+    carry ``response_format``; ``error`` is raised by every call;
+    ``release`` is awaited before the first piece is sent.
+    """
+    from types import SimpleNamespace
+
+    from orchestrator import planner
+
+    def install(replies=(_SCAN_REPLY,), fail_json_mode=False, error=None, release=None):
+        calls = _LLMCalls()
+
+        class FakeStream:
+            async def __aiter__(self):
+                if release is not None:
+                    await release.wait()
+                for piece in replies:
+                    calls.streamed.append(piece)
+                    yield _chunk(piece)
+
+            async def close(self):
+                calls.closed += 1
+
+        class FakeCompletions:
+            async def create(self, **kwargs):
+                calls.append(kwargs)
+                if error is not None:
+                    raise error
+                if fail_json_mode and "response_format" in kwargs:
+                    raise _FakeBadRequest("response_format is not supported")
+                return FakeStream()
+
+        client = SimpleNamespace(chat=SimpleNamespace(completions=FakeCompletions()))
+        monkeypatch.setattr(planner, "_get_async_llm_client", lambda: client)
+        monkeypatch.setattr(planner, "_plan_cache", {})
+        monkeypatch.setattr(planner, "BadRequestError", _FakeBadRequest)
+        monkeypatch.setattr(planner, "_json_mode_rejected", False)
+        return calls
+
+    return install
+
+
+async def test_async_planner_streams_until_plan_complete(fake_llm):
+    from orchestrator import planner
+
+    pieces = [
+        "```json\n{\"steps\": [{\"type\": \"local\", ",
+        "\"action\": \"summarise_text\", \"params\": {\"text\": \"a } b\"}}]}",
+        "\n```",
+        "Hope this helps!",
+    ]
+    calls = fake_llm(pieces)
+
+    plan = await planner.aplan_objective("say hi")
+    assert [s.action for s in plan.steps] == ["summarise_text"]
+    assert plan.steps[0].params == {"text": "a } b"}
+    assert calls[0]["stream"] is True
+    assert calls[0]["response_format"] == {"type": "json_object"}
+    assert calls[0]["messages"][-1]["content"] == "say hi"
+    # Reading stopped at the closing brace of the plan
+    assert calls.streamed == pieces[:2]
+    assert calls.closed == 1
+
+
+async def test_rejected_json_mode_is_retried_without_it(fake_llm, caplog):
+    from orchestrator import planner
+
+    calls = fake_llm(fail_json_mode=True)
+
+    plan = await planner.aplan_objective("scan my projects")
+    assert [s.action for s in plan.steps] == ["scan_directory"]
+    assert ["response_format" in c for c in calls] == [True, False]
+    assert "rejected response_format" in caplog.text
+
+    # Later objectives skip JSON mode straight away
+    await planner.aplan_objective("scan other projects")
+    assert "response_format" not in calls[-1]
+    assert len(calls) == 3
+
+
+async def test_unrelated_bad_request_keeps_json_mode(fake_llm):
+    from orchestrator import planner
+
+    calls = fake_llm(
+        error=_FakeBadRequest("This model's maximum context length is 8192 tokens", param="messages")
+    )
+
+    plan = await planner.aplan_objective("scan my projects")
+    keyword_plan = planner._plan_with_keywords("scan my projects")
+    assert [s.action for s in plan.steps] == [s.action for s in keyword_plan.steps]
+    assert len(calls) == 1
+    assert planner._json_mode_rejected is False
+
+    await planner.aplan_objective("scan other projects")
+    assert "response_format" in calls[-1]
+
+
+async def test_repeated_objective_reuses_llm_reply(fake_llm):
+    from orchestrator import planner
+
+    calls = fake_llm()
+
+    first = await planner.aplan_objective("scan my  projects")
+    second = await planner.aplan_objective("  scan my projects ")
+    assert len(calls) == 1
+    assert [s.action for s in second.steps] == ["scan_directory"]
+    assert second.task_id != first.task_id
+
+
+async def test_concurrent_identical_objectives_share_one_request(fake_llm):
+    import asyncio
+
+    from orchestrator import planner
+
+    release = asyncio.Event()
+    calls = fake_llm(release=release)
+
+    tasks = [asyncio.create_task(planner.aplan_objective("scan projects")) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    plans = await asyncio.gather(*tasks)
+
+    assert len(calls) == 1
+    assert all([s.action for s in p.steps] == ["scan_directory"] for p in plans)
+    assert len({p.task_id for p in plans}) == 3
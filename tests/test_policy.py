@@ -51,6 +51,29 @@ class TestFetchPolicy:
         assert policy.validate("u_1", plan) is None
         assert policy.validate("u_1", plan) == RejectionReason.QUOTA_EXCEEDED
 
+    def test_rate_limit_window_expires(self, monkeypatch):
+        import orchestrator.policy as fetch_policy_module
+
+        clock = [1000.0]
+        monkeypatch.setattr(fetch_policy_module.time, "time", lambda: clock[0])
+        policy = FetchPolicy(rate_limit_per_minute=2)
+        assert policy.check_rate_limit("u_1") is None
+        clock[0] += 30
+        assert policy.check_rate_limit("u_1") is None
+        assert policy.check_rate_limit("u_1") == RejectionReason.QUOTA_EXCEEDED
+        # The first request leaves the window; the second is still inside
+        clock[0] += 30
+        assert policy.check_rate_limit("u_1") is None
+        assert policy.check_rate_limit("u_1") == RejectionReason.QUOTA_EXCEEDED
+
+    def test_rate_limit_is_exact_under_concurrency(self):
+        from concurrent.futures import ThreadPoolExecutor
+
+        policy = FetchPolicy(rate_limit_per_minute=25)
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda _: policy.check_rate_limit("u_1"), range(200)))
+        assert results.count(None) == 25
+
 
 # =========================================================================
 # Local policy
@@ -97,3 +120,76 @@ class TestLocalPolicy:
             ]
         )
         assert policy.validate_plan(plan) is None
+
+    def test_sibling_with_shared_prefix_rejected(self):
+        policy = LocalPolicy(allowed_paths=["/tmp/sandbox"])
+        plan = TaskPlan(
+            steps=[
+                TaskStep(
+                    type=StepType.LOCAL,
+                    action="scan_directory",
+                    params={"path": "/tmp/sandbox-evil"},
+                )
+            ]
+        )
+        assert policy.validate_plan(plan) == RejectionReason.PATH_NOT_ALLOWED
+
+    def test_sandbox_root_itself_passes(self):
+        policy = LocalPolicy(allowed_paths=["/tmp/sandbox"])
+        plan = TaskPlan(
+            steps=[
+                TaskStep(
+                    type=StepType.LOCAL,
+                    action="scan_directory",
+                    params={"path": "/tmp/sandbox"},
+                )
+            ]
+        )
+        assert policy.validate_plan(plan) is None
+
+    def test_nested_and_sibling_roots(self):
+        policy = LocalPolicy(
+            allowed_paths=["/srv/a", "/srv/a/b", "/srv/a-b", "/opt/x"]
+        )
+        for path, expected in [
+            ("/srv/a/c/file", None),
+            ("/srv/a/b/file", None),
+            ("/srv/a-b", None),
+            ("/srv/ab", RejectionReason.PATH_NOT_ALLOWED),
+            ("/opt/x/y", None),
+            ("/aaa", RejectionReason.PATH_NOT_ALLOWED),
+        ]:
+            plan = TaskPlan(
+                steps=[
+                    TaskStep(
+                        type=StepType.LOCAL,
+                        action="scan_directory",
+                        params={"path": path},
+                    )
+                ]
+            )
+            assert policy.validate_plan(plan) == expected, path
+
+    def test_validate_dict_matches_validate_plan(self):
+        policy = LocalPolicy(allowed_paths=["/tmp"])
+        ok = TaskPlan(
+            steps=[
+                TaskStep(
+                    type=StepType.LOCAL,
+                    action="scan_directory",
+                    params={"path": "/tmp/mydata"},
+                )
+            ]
+        ).model_dump(mode="json")
+        assert policy.validate_dict(ok) is None
+
+        ok["steps"][0]["params"]["path"] = "/etc"
+        assert policy.validate_dict(ok) == RejectionReason.PATH_NOT_ALLOWED
+
+        ok["steps"][0]["action"] = "rm_rf"
+        assert policy.validate_dict(ok) == RejectionReason.ACTION_NOT_ALLOWED
+
+    def test_validate_dict_malformed(self):
+        policy = LocalPolicy()
+        assert policy.validate_dict({}) == RejectionReason.POLICY_VIOLATION
+        assert policy.validate_dict({"steps": ["x"]}) == RejectionReason.POLICY_VIOLATION
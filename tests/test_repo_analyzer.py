@@ -1,8 +1,10 @@
 """Tests for connector.workflows.repo_analyzer -- GitHub repo health analyzer."""
 
+import copy
 import os
 import subprocess
 import tempfile
+import time
 from pathlib import Path
 
 import pytest
@@ -14,10 +16,13 @@ from connector.workflows.repo_analyzer import (
     _check_dependencies,
     _check_security_files,
     _compute_health_score,
+    _count_file_lines,
     _count_files,
     _count_lines_by_language,
     _detect_tests,
+    _dir_size_mb,
     _git_stats,
+    _remove_tree_in_background,
 )
 from orchestrator.planner import _extract_github_url
 
@@ -68,11 +73,31 @@ class TestCloneRepo:
         result = clone_repo({"url": "https://github.com/nonexistent-user-xyz/nonexistent-repo-abc"})
         assert "error" in result
 
+    def test_owner_and_repo_parsed_from_url(self, monkeypatch):
+        from connector.workflows import repo_analyzer
+
+        def fake_run(cmd, cwd=None, timeout=120):
+            if "clone" in cmd:
+                os.makedirs(cmd[-1])
+                return subprocess.CompletedProcess(cmd, 0, "", "")
+            return subprocess.CompletedProcess(cmd, 1, "", "")
+
+        monkeypatch.setattr(repo_analyzer, "_run", fake_run)
+        result = clone_repo({"url": "https://github.com/octo/octo.github.io.git"})
+        try:
+            assert (result["owner"], result["repo_name"]) == ("octo", "octo.github.io")
+        finally:
+            repo_analyzer.shutil.rmtree(result["tmpdir"], ignore_errors=True)
+
 
 # ---------------------------------------------------------------------------
 # Helper functions with a fake repo
 # ---------------------------------------------------------------------------
 
+# Output is discarded rather than piped back; failures still raise
+_QUIET_GIT = {"stdout": subprocess.DEVNULL, "stderr": subprocess.DEVNULL, "check": True}
+
+
 @pytest.fixture
 def fake_repo(tmp_path):
     """Create a minimal fake git repo with some files for analysis."""
@@ -80,9 +105,7 @@ def fake_repo(tmp_path):
     repo_dir.mkdir()
 
     # Init git
-    subprocess.run(["git", "init", str(repo_dir)], capture_output=True)
-    subprocess.run(["git", "-C", str(repo_dir), "config", "user.email", "test@test.com"], capture_output=True)
-    subprocess.run(["git", "-C", str(repo_dir), "config", "user.name", "Test"], capture_output=True)
+    subprocess.run(["git", "init", str(repo_dir)], **_QUIET_GIT)
 
     # Create source files
     (repo_dir / "main.py").write_text("print('hello')\nx = 1\ny = 2\n")
@@ -101,10 +124,15 @@ def fake_repo(tmp_path):
     (repo_dir / "pytest.ini").write_text("[pytest]\n")
 
     # Git commit
-    subprocess.run(["git", "-C", str(repo_dir), "add", "."], capture_output=True)
+    subprocess.run(["git", "-C", str(repo_dir), "add", "."], **_QUIET_GIT)
+    # Identity passed per command: saves two `git config` processes per test
     subprocess.run(
-        ["git", "-C", str(repo_dir), "commit", "-m", "initial commit"],
-        capture_output=True,
+        [
+            "git", "-C", str(repo_dir),
+            "-c", "user.email=test@test.com", "-c", "user.name=Test",
+            "commit", "-m", "initial commit",
+        ],
+        **_QUIET_GIT,
     )
 
     return str(repo_dir)
@@ -121,6 +149,40 @@ class TestCountLinesByLanguage:
         langs = _count_lines_by_language(fake_repo)
         assert "JavaScript" in langs
 
+    def test_counts_extensionless_files_by_name(self, fake_repo, monkeypatch):
+        from connector.workflows import repo_analyzer
+
+        monkeypatch.setattr(repo_analyzer, "_cloc_languages", lambda path: None)
+        (Path(fake_repo) / "Dockerfile").write_text("FROM python:3.11\nCOPY . /app\n")
+        langs = _count_lines_by_language(fake_repo)
+        assert langs["Dockerfile"] == 2
+
+    def test_prefers_cloc_when_available(self, fake_repo, monkeypatch):
+        from connector.workflows import repo_analyzer
+
+        monkeypatch.setattr(repo_analyzer, "_cloc_languages", lambda path: {"Rust": 10})
+        assert _count_lines_by_language(fake_repo) == {"Rust": 10}
+
+
+class TestCountFileLines:
+
+    def test_counts_trailing_line_without_newline(self, tmp_path):
+        path = tmp_path / "a.py"
+        path.write_bytes(b"a\nb\nc")
+        assert _count_file_lines(str(path)) == 3
+        path.write_bytes(b"a\nb\n")
+        assert _count_file_lines(str(path)) == 2
+        path.write_bytes(b"")
+        assert _count_file_lines(str(path)) == 0
+
+    def test_skips_oversized_files(self, tmp_path, monkeypatch):
+        from connector.workflows import repo_analyzer
+
+        monkeypatch.setattr(repo_analyzer, "_MAX_COUNT_BYTES", 4)
+        path = tmp_path / "bundle.min.js"
+        path.write_bytes(b"a\nb\nc\n")
+        assert _count_file_lines(str(path)) is None
+
 
 class TestCountFiles:
 
@@ -130,6 +192,60 @@ class TestCountFiles:
         assert stats["total_dirs"] >= 0
 
 
+class TestPruneDirs:
+
+    def test_vendor_and_vcs_dirs_are_not_scanned(self, fake_repo):
+        files_before = _count_files(fake_repo)["total_files"]
+        langs_before = _count_lines_by_language(fake_repo)
+        for vendored in ("node_modules/pkg", "venv/lib", "src/.git"):
+            path = Path(fake_repo) / vendored
+            path.mkdir(parents=True)
+            (path / "index.js").write_text("module.exports = 1;\n")
+            (path / "test_x.py").write_text("def test_x():\n    pass\n")
+
+        assert _count_files(fake_repo)["total_files"] == files_before
+        assert _count_lines_by_language(fake_repo) == langs_before
+        assert _detect_tests(fake_repo)["test_files"] == 1
+
+    def test_secrets_scan_still_covers_pruned_dirs(self, fake_repo):
+        for dirname in (".vscode", "venv", "build", "src/.git"):
+            path = Path(fake_repo) / dirname
+            path.mkdir(parents=True)
+            (path / "credentials.json").write_text("{}\n")
+
+        findings = _check_security_files(fake_repo)["findings"]
+        assert len(findings) == 1
+        for reported in (".vscode/credentials.json", "venv/credentials.json", "build/credentials.json"):
+            assert reported in findings[0]
+        assert "src/.git" not in findings[0]
+
+
+class TestRepoSize:
+
+    def test_counts_every_file_in_the_tree(self, tmp_path):
+        (tmp_path / "data.bin").write_bytes(b"x" * 2048)
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "sub" / "more.bin").write_bytes(b"x" * 1024)
+        assert _dir_size_mb(str(tmp_path)) == 3072 / (1024 * 1024)
+
+
+class TestRemoveTreeInBackground:
+
+    def test_tree_is_renamed_then_removed(self, tmp_path):
+        doomed = tmp_path / "repo_analysis_x"
+        (doomed / "repo").mkdir(parents=True)
+        (doomed / "repo" / "a.py").write_text("x = 1\n")
+
+        _remove_tree_in_background(str(doomed))
+        assert not doomed.exists()
+
+        deleting = tmp_path / "repo_analysis_x.deleting"
+        deadline = time.monotonic() + 5
+        while deleting.exists() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert not deleting.exists()
+
+
 class TestGitStats:
 
     def test_git_stats(self, fake_repo):
@@ -138,6 +254,24 @@ class TestGitStats:
         assert stats["total_contributors"] >= 1
         assert stats["default_branch"] in ("main", "master")
 
+    def test_pygit2_matches_git_cli(self, fake_repo, monkeypatch):
+        from connector.workflows import repo_analyzer
+
+        if repo_analyzer.pygit2 is None:
+            pytest.skip("pygit2 not installed")
+        in_process = _git_stats(fake_repo)
+        monkeypatch.setattr(repo_analyzer, "pygit2", None)
+        assert _git_stats(fake_repo) == in_process
+
+    def test_branch_read_without_git(self, fake_repo, monkeypatch):
+        from connector.workflows import repo_analyzer
+
+        monkeypatch.setattr(repo_analyzer, "pygit2", None)
+        subprocess.run(["git", "-C", fake_repo, "checkout", "-q", "-b", "feat/x"], check=True)
+        assert _git_stats(fake_repo)["default_branch"] == "feat/x"
+        subprocess.run(["git", "-C", fake_repo, "checkout", "-q", "--detach"], check=True)
+        assert _git_stats(fake_repo)["default_branch"] == "unknown"
+
 
 class TestDetectTests:
 
@@ -146,6 +280,12 @@ class TestDetectTests:
         assert "pytest" in tests["frameworks"]
         assert tests["test_files"] >= 1
 
+    def test_ignores_parent_directory_names(self, fake_repo):
+        # tmp_path is named after this test ("test_..."), which must not
+        # make every file in the repo look like a test
+        tests = _detect_tests(fake_repo)
+        assert tests["test_files"] == 1
+
 
 class TestCheckDependencies:
 
@@ -163,6 +303,11 @@ class TestCheckSecurityFiles:
         assert security["has_license"] is True
         assert security["has_gitignore"] is True
 
+    def test_detects_github_workflows(self, fake_repo):
+        assert _check_security_files(fake_repo)["has_ci"] is False
+        (Path(fake_repo) / ".github" / "workflows").mkdir(parents=True)
+        assert _check_security_files(fake_repo)["has_ci"] is True
+
 
 class TestComputeHealthScore:
 
@@ -214,6 +359,41 @@ class TestAnalyzeRepo:
         result = analyze_repo({}, {})
         assert "error" in result
 
+    def test_reuses_analysis_of_same_commit(self, fake_repo, tmp_path, monkeypatch):
+        from connector.workflows import repo_analyzer
+
+        monkeypatch.setattr(repo_analyzer, "_analysis_cache", {})
+
+        def fresh_clone(name):
+            tmpdir = tmp_path / name
+            tmpdir.mkdir()
+            subprocess.run(
+                ["git", "clone", "-q", fake_repo, str(tmpdir / "repo")], check=True
+            )
+            return {
+                "clone_path": str(tmpdir / "repo"),
+                "tmpdir": str(tmpdir),
+                "url": f"https://github.com/test/{name}",
+                "owner": "test",
+                "repo_name": name,
+                "size_mb": 0.1,
+            }
+
+        first = analyze_repo({}, fresh_clone("first"))
+        expected = {k: v for k, v in first.items() if k not in ("repo_name", "url")}
+        expected = copy.deepcopy(expected)
+        # Downstream steps may mutate the result; the cache must not see it
+        first["files"]["total_files"] = -1
+        first["git"]["top_contributors"].clear()
+
+        def no_scan(repo_path):
+            raise AssertionError("cached commit was re-scanned")
+
+        monkeypatch.setattr(repo_analyzer, "_scan_repo", no_scan)
+        second = analyze_repo({}, fresh_clone("second"))
+        assert second["repo_name"] == "second"
+        assert {k: v for k, v in second.items() if k not in ("repo_name", "url")} == expected
+
 
 # ---------------------------------------------------------------------------
 # generate_health_report
@@ -1,30 +1,33 @@
 """Tests for orchestrator.storage – pairing store."""
 
+import pytest
+
 from orchestrator.storage import PairingStore
 
 
-def test_pair_and_lookup():
-    store = PairingStore()
+@pytest.fixture
+def store():
+    return PairingStore()
+
+
+def test_pair_and_lookup(store):
     rec = store.pair("u_1", "dev_1", "aa" * 32)
     assert rec.user_id == "u_1"
     assert store.is_paired("u_1", "dev_1") is True
     assert store.get("u_1", "dev_1") is not None
 
 
-def test_unpair():
-    store = PairingStore()
+def test_unpair(store):
     store.pair("u_1", "dev_1", "bb" * 32)
     assert store.unpair("u_1", "dev_1") is True
     assert store.is_paired("u_1", "dev_1") is False
 
 
-def test_unpair_nonexistent():
-    store = PairingStore()
+def test_unpair_nonexistent(store):
     assert store.unpair("u_1", "dev_1") is False
 
 
-def test_devices_for_user():
-    store = PairingStore()
+def test_devices_for_user(store):
     store.pair("u_1", "dev_1", "aa" * 32)
     store.pair("u_1", "dev_2", "bb" * 32)
     store.pair("u_2", "dev_3", "cc" * 32)
@@ -33,8 +36,18 @@ def test_devices_for_user():
     assert len(store.devices_for_user("u_3")) == 0
 
 
-def test_all_devices():
-    store = PairingStore()
+def test_all_devices(store):
     store.pair("u_1", "dev_1", "aa" * 32)
     store.pair("u_2", "dev_2", "bb" * 32)
     assert len(store.all_devices()) == 2
+
+
+def test_devices_for_user_after_unpair_keeps_pairing_order(store):
+    store.pair("u_1", "dev_1", "aa" * 32)
+    store.pair("u_1", "dev_2", "bb" * 32)
+    store.pair("u_1", "dev_3", "cc" * 32)
+    store.unpair("u_1", "dev_2")
+    assert [r.device_id for r in store.devices_for_user("u_1")] == ["dev_1", "dev_3"]
+    store.unpair("u_1", "dev_1")
+    store.unpair("u_1", "dev_3")
+    assert store.devices_for_user("u_1") == []